@@ -0,0 +1,41 @@
+# times parsers/constant.py on a header made mostly of large @interface blocks and on one made
+# of plain constant declarations.
+# run with: python -m benchmarks.bench_constant
+import timeit
+
+from parsers import constant
+
+INTERFACE = """
+@interface YPUserBadgeView%(i)d : UIView <YKImageLoaderDelegate> {
+  YKImageLoader *_imageLoader;
+  NSString *_userName;
+  CGSize _imageSize;
+}
+@property (copy, nonatomic) NSString *userName;
+- (void)setUserName:(NSString *)userName location:(NSString *)location;
+%(methods)s
+@end
+
+extern NSString *const YPUserBadgeView%(i)dDidTapNotification;
+static const CGFloat kYPUserBadgeView%(i)dHeight = 44.0;
+"""
+
+METHODS = "\n".join("- (void)method%d:(NSString *)value;" % i for i in range(100))
+
+def make_header(blocks):
+    return "".join(INTERFACE % {'i': i, 'methods': METHODS} for i in range(blocks))
+
+def make_constants_header(count):
+    return "".join("extern NSString *const YPConstant%dNotification; // note %d\n" % (i, i) for i in range(count))
+
+def run():
+    cases = [
+        ("interface-heavy", make_header(200)),
+        ("constant-heavy", make_constants_header(20000)),
+    ]
+    for name, content in cases:
+        seconds = min(timeit.repeat(lambda: constant.parse(content), number=1, repeat=5))
+        print("%-16s %5d KB: %.4f s (%.0f KB/s)" % (name, len(content) // 1024, seconds, len(content) / 1024.0 / seconds))
+
+if __name__ == '__main__':
+    run()
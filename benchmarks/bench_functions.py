@@ -0,0 +1,50 @@
+# times parsers/functions.py against the FUNCTION_RE scan it replaced, which fired at every
+# "identifier(" in the header, on method-heavy headers and on generated ones.
+# run with: python -m benchmarks.bench_functions
+import random
+import re
+import timeit
+
+from benchmarks import corpus
+from parsers import functions, utils
+
+LEGACY_FUNCTION_RE = re.compile(r'([\+\-@]*.*?)([A-Za-z]\w*)(?=\s*\([^\^])', re.ASCII)
+LEGACY_RESERVED_TOKENS = {"@", "typedef", "#define", "while", "if", "switch"}
+
+def legacy(content):
+    names = []
+    for m in LEGACY_FUNCTION_RE.finditer(content):
+        if not m.group(1) or (all([token not in m.group(1) and token != m.group(2) for token in LEGACY_RESERVED_TOKENS])):
+            names.append(m.group(2))
+    return names
+
+METHODS = """
+- (void)loadItem:(NSInteger)index completion:(void (^)(BOOL finished))completion API_AVAILABLE(ios(10.0));
+- (instancetype)initWithFrame:(CGRect)frame style:(YPStyle)style NS_DESIGNATED_INITIALIZER;
+@property (nonatomic, copy, nullable) void (^handler)(NSArray<NSString *> *values);
+- (CGSize)sizeThatFits:(CGSize)size;
+"""
+
+def method_heavy(size):
+    body = METHODS * (size // len(METHODS) + 1)
+    return "@interface YPView : UIView\n%s@end\n\nNSString *YPNameFromView(YPView *view);\n" % body
+
+def run():
+    headers = [
+        ("methods/100KB", method_heavy(100 * 1024)),
+        ("methods/1MB", method_heavy(1024 * 1024)),
+        ("corpus/100KB", corpus.generate_header(random.Random(0), "YPBench", 100 * 1024)[0]),
+        ("corpus/1MB", corpus.generate_header(random.Random(0), "YPBench", 1024 * 1024)[0]),
+    ]
+    print("%-14s %10s %10s %10s %10s" % ("header", "legacy", "current", "speedup", "same"))
+    for name, content in headers:
+        content = utils.scrub(content)
+        header = utils.Header(content)
+        legacy_seconds = min(timeit.repeat(lambda: legacy(content), number=1, repeat=3))
+        current_seconds = min(timeit.repeat(lambda: functions.parse.symbols(header), number=1, repeat=3))
+        same = sorted(legacy(content)) == sorted(symbol.name for symbol in functions.parse.symbols(header))
+        print("%-14s %10.4f %10.4f %9.0fx %10s" % (
+            name, legacy_seconds, current_seconds, legacy_seconds / current_seconds, same))
+
+if __name__ == '__main__':
+    run()
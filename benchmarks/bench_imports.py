@@ -0,0 +1,80 @@
+# compares the --dead scan restricted to the files that import each symbol's header with the full
+# scan (--no-prune) that counts a use from any file, on a generated tree where some files mention
+# names from headers they never import.
+# run with: python -m benchmarks.bench_imports [header count]
+import io
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+import imports
+import search
+from benchmarks import corpus
+
+HEADER_SIZE = 12 * 1024
+# app-level sources that import a few headers and mention names from a few others
+APP_SOURCES = 50
+APP_IMPORTS = 5
+APP_STRAY_HEADERS = 5
+
+def write_app_sources(rng, directory):
+    headers = sorted(
+        os.path.join(root, name) for root, _, names in os.walk(directory) for name in names if name.endswith('.h')
+    )
+    for i in range(APP_SOURCES):
+        imported = rng.sample(headers, APP_IMPORTS)
+        used = imported + rng.sample(headers, APP_STRAY_HEADERS)
+        names = []
+        for header in used:
+            with open(header) as source:
+                names.extend(symbol.name for symbol in search.parse_content(source.read())[:20])
+        body = "".join("    [self use:%s];\n" % name for name in names)
+        includes = "".join('#import "%s"\n' % os.path.basename(header) for header in imported)
+        with open(os.path.join(directory, "YPApp%d.m" % i), 'w') as source:
+            source.write("%s\n@implementation YPApp%d\n- (void)run {\n%s}\n@end\n" % (includes, i, body))
+
+def run_main(argv):
+    saved_argv, saved_stdout = sys.argv, sys.stdout
+    sys.argv, sys.stdout = ['search.py'] + argv, io.StringIO()
+    try:
+        search.main()
+        return sys.stdout.getvalue().count("Unused:")
+    finally:
+        sys.argv, sys.stdout = saved_argv, saved_stdout
+
+def search_space(directory):
+    # (symbol, file) pairs each mode can take a use from
+    paths = list(search.iter_files([directory], {'.h', '.m'}))
+    graph = imports.ImportGraph(map(imports.scan_imports, paths))
+    full = pruned = 0
+    for header_path, symbols in map(search.get_symbols, [path for path in paths if path.endswith('.h')]):
+        full += len(symbols) * len(paths)
+        if graph.visible_everywhere(header_path):
+            pruned += len(symbols) * len(paths)
+        else:
+            pruned += len(symbols) * sum(graph.sees(path, header_path) for path in paths)
+    return full, pruned
+
+def run(count):
+    directory = tempfile.mkdtemp()
+    try:
+        corpus.write_corpus(directory, count, HEADER_SIZE)
+        write_app_sources(random.Random(0), directory)
+        full, pruned = search_space(directory)
+        print("%-10s %10s %10s %14s" % ("mode", "seconds", "unused", "symbol x file"))
+        for mode, extra, pairs in (("full", ['--no-prune'], full), ("pruned", [], pruned)):
+            argv = [directory, '--dead', '--no-cache', '--jobs', '1'] + extra
+            seconds = []
+            for _ in range(3):
+                start = time.time()
+                unused = run_main(argv)
+                seconds.append(time.time() - start)
+            print("%-10s %10.3f %10d %14d" % (mode, min(seconds), unused, pairs))
+    finally:
+        shutil.rmtree(directory)
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,63 @@
+# measures what interning.pack saves on the way back from pool workers, and how much memory the
+# parent needs to keep every header's symbols as per-header lists of names (as search.py used to)
+# and as an interning.SymbolTable. copies re-declares every header's symbols in that many more
+# headers, the way real trees repeat selectors and property names across classes.
+# run with: python -m benchmarks.bench_interning [header count] [copies]
+import pickle
+import random
+import sys
+import time
+import tracemalloc
+
+import interning
+import search
+from benchmarks import corpus
+
+HEADER_SIZE = 12 * 1024
+
+def kept_memory(wire, keep):
+    # bytes still allocated after unpickling every result and keeping it with keep
+    tracemalloc.start()
+    kept = keep(wire)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return size
+
+def keep_lists(wire):
+    return [(path, [symbol.name for symbol in symbols]) for path, symbols in map(pickle.loads, wire)]
+
+def keep_table(wire):
+    table = interning.SymbolTable()
+    for path, symbols in map(pickle.loads, wire):
+        table.add(path, symbols)
+    table.freeze()
+    return table
+
+def run(count, copies):
+    rng = random.Random(0)
+    results = []
+    for i in range(count):
+        content, _ = corpus.generate_header(rng, "YP%d" % i, HEADER_SIZE)
+        symbols = search.parse_content(content)
+        results.extend(("Copy%d/YP%d.h" % (copy, i), symbols) for copy in range(copies + 1))
+    plain = [pickle.dumps(result, -1) for result in results]
+    packed = [pickle.dumps((path, interning.pack(symbols)), -1) for path, symbols in results]
+    print("%d headers, %d symbols" % (len(results), sum(len(symbols) for _, symbols in results)))
+
+    print("%-10s %14s %14s" % ("transfer", "bytes", "seconds"))
+    start = time.time()
+    for data in plain:
+        pickle.loads(data)
+    print("%-10s %14d %14.3f" % ("symbols", sum(map(len, plain)), time.time() - start))
+    start = time.time()
+    for data in packed:
+        interning.unpack(pickle.loads(data)[1])
+    print("%-10s %14d %14.3f" % ("packed", sum(map(len, packed)), time.time() - start))
+
+    print("%-10s %14s" % ("parent", "bytes"))
+    print("%-10s %14d" % ("lists", kept_memory(plain, keep_lists)))
+    print("%-10s %14d" % ("table", kept_memory(plain, keep_table)))
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 500, int(sys.argv[2]) if len(sys.argv) > 2 else 0)
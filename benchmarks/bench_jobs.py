@@ -0,0 +1,31 @@
+# measures how header parsing throughput scales with search.py --jobs.
+# run with: python -m benchmarks.bench_jobs [header count]
+import shutil
+import sys
+import tempfile
+import time
+from multiprocessing import cpu_count
+
+import search
+from benchmarks import corpus
+
+# about the size of a real header
+HEADER_SIZE = 12 * 1024
+
+def run(count):
+    directory = tempfile.mkdtemp()
+    try:
+        corpus.write_corpus(directory, count, HEADER_SIZE, sources=False)
+        jobs_options = sorted({1, 2, 4, 8, cpu_count()})
+        print("%-6s %10s %14s" % ("jobs", "seconds", "headers/s"))
+        for jobs in jobs_options:
+            start = time.time()
+            for _ in search.map_unordered(search.get_symbols, search.iter_files([directory], {'.h'}), jobs):
+                pass
+            seconds = time.time() - start
+            print("%-6d %10.3f %14.0f" % (jobs, seconds, count / seconds))
+    finally:
+        shutil.rmtree(directory)
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
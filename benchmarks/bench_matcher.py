@@ -0,0 +1,46 @@
+# compares the usage-search strategies in matcher.py against a per-symbol regex search.
+# run with: python -m benchmarks.bench_matcher
+import random
+import re
+import timeit
+
+from matcher import IdentifierMatcher, AhoCorasickMatcher
+
+FILE_COUNT = 20
+SYMBOL_COUNTS = [100, 1000, 10000]
+NAIVE_MAX_SYMBOLS = 1000
+
+def make_symbols(rng, count):
+    return ["YP%sSymbol%d" % (rng.choice(["Watch", "Search", "Review", "Account"]), i) for i in range(count)]
+
+def make_source(rng, symbols, lines=400):
+    body = []
+    for _ in range(lines):
+        body.append("    [self.%s performWithValue:%s count:%d];" % (
+            rng.choice(["controller", "view", "model"]), rng.choice(symbols), rng.randint(0, 100)))
+    return "@implementation YPThing\n- (void)run {\n%s\n}\n@end\n" % "\n".join(body)
+
+def naive_matches(symbols, content):
+    return {symbol for symbol in symbols if re.search(r"\b%s\b" % re.escape(symbol), content)}
+
+def run():
+    rng = random.Random(0)
+    print("%-8s %-14s %10s %12s" % ("symbols", "mode", "seconds", "KB/s"))
+    for symbol_count in SYMBOL_COUNTS:
+        symbols = make_symbols(rng, symbol_count)
+        sources = [make_source(rng, symbols) for _ in range(FILE_COUNT)]
+        kilobytes = sum(len(source) for source in sources) / 1024.0
+
+        modes = [
+            ("identifier", IdentifierMatcher(symbols).matches),
+            ("aho-corasick", AhoCorasickMatcher(symbols).matches),
+        ]
+        if symbol_count <= NAIVE_MAX_SYMBOLS:
+            modes.append(("naive-regex", lambda content: naive_matches(symbols, content)))
+
+        for name, matches in modes:
+            seconds = min(timeit.repeat(lambda: [matches(source) for source in sources], number=1, repeat=3))
+            print("%-8d %-14s %10.4f %12.0f" % (symbol_count, name, seconds, kilobytes / seconds))
+
+if __name__ == '__main__':
+    run()
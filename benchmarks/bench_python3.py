@@ -0,0 +1,66 @@
+# compares end to end throughput of search.py under Python 2, at a revision from before the
+# Python 3 port, with this tree under the current interpreter, on the same generated corpus. also
+# checks that both report the same unused symbols.
+# run with: python -m benchmarks.bench_python3 REV [--python2 PATH] [--files N] [--size BYTES]
+import argparse
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+
+from benchmarks import corpus
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def export_revision(revision, directory):
+    archive = subprocess.check_output(['git', '-C', ROOT, 'archive', '--format=tar', revision])
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(directory)
+
+def time_search(python, tree, corpus_dir, repeat=3):
+    # (best seconds, sorted output lines)
+    command = [python, os.path.join(tree, 'search.py'), corpus_dir, '--no-cache', '--dead', '--jobs', '1']
+    best = None
+    for _ in range(repeat):
+        start = time.time()
+        output = subprocess.check_output(command, cwd=tree)
+        seconds = time.time() - start
+        best = seconds if best is None else min(best, seconds)
+    return best, sorted(output.decode('utf-8').splitlines())
+
+def main():
+    parser = argparse.ArgumentParser(description='Python 2 vs Python 3 end to end throughput')
+    parser.add_argument('revision', help="a revision from before the Python 3 port")
+    parser.add_argument('--python2', default='python2')
+    parser.add_argument('--files', type=int, default=300)
+    parser.add_argument('--size', type=int, default=8 * 1024, help="bytes per header")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        corpus_dir = os.path.join(directory, 'corpus')
+        old_tree = os.path.join(directory, 'old')
+        os.makedirs(corpus_dir)
+        total = corpus.write_corpus(corpus_dir, args.files, args.size)
+        export_revision(args.revision, old_tree)
+
+        print("%d headers, %.1f MB of headers" % (args.files, total / 1024.0 / 1024))
+        print("%-40s %10s %10s %10s" % ("interpreter", "seconds", "files/s", "MB/s"))
+        outputs = []
+        for python, tree, name in [(args.python2, old_tree, args.revision), (sys.executable, ROOT, "this tree")]:
+            seconds, output = time_search(python, tree, corpus_dir)
+            outputs.append(output)
+            version = subprocess.check_output([python, '-c', 'import sys; print(sys.version.split()[0])'])
+            label = "Python %s, %s" % (version.decode('ascii').strip(), name)
+            print("%-40s %10.3f %10.1f %10.2f" % (label, seconds, args.files / seconds, total / 1024.0 / 1024 / seconds))
+        print("same output" if outputs[0] == outputs[1] else "OUTPUT DIFFERS")
+        return 0 if outputs[0] == outputs[1] else 1
+    finally:
+        shutil.rmtree(directory)
+
+if __name__ == '__main__':
+    exit(main())
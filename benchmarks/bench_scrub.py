@@ -0,0 +1,50 @@
+# compares utils.scrub_comments with the two-pass re.sub scrubber it replaced, on generated
+# headers. run with: python -m benchmarks.bench_scrub
+import re
+import timeit
+
+from parsers.utils import scrub_comments
+
+LEGACY_SINGLE_LINE_RE = re.compile(r"\/\/.*\n")
+LEGACY_MULTI_LINE_RE = re.compile(r"\/\*.*?\*\/", re.DOTALL)
+
+def legacy_scrub_comments(string):
+    result = LEGACY_SINGLE_LINE_RE.sub("\n", string)
+    result = LEGACY_MULTI_LINE_RE.sub("", result)
+    return result
+
+CHUNK = """
+/**
+ * Places in the app where we might request the Weekly from. These are necessary in order to send
+ * back Weekly issues in different places based on the source.
+ */
+typedef NS_ENUM(NSInteger, YPWeeklyYelpRequestSource) {
+  YPWeeklyYelpRequestSourceUnknown = 0, /* we don't know the source */
+  YPWeeklyYelpRequestSourceDiscover, // request weekly from the discover tab
+};
+static NSString * const kYPWeeklyURL = @"http://www.yelp.com/weekly";
+"""
+
+def make_header(size):
+    return CHUNK * (size // len(CHUNK) + 1)
+
+def make_fragment_header(size):
+    # lots of "/*" with no closing "*/", which the lazy DOTALL regex rescans to the end of the file
+    # for every one of them
+    return "int a; /* x\n" * (size // 12 + 1)
+
+def run():
+    cases = [
+        ("1 MB header", make_header(1024 * 1024)),
+        # no literal hides a comment marker, so the header is split on comments alone
+        ("1 MB header, no URLs", make_header(1024 * 1024).replace("http://", "")),
+        ("64 KB /* fragments", make_fragment_header(64 * 1024)),
+    ]
+    print("%-22s %-8s %10s" % ("input", "scrubber", "seconds"))
+    for name, content in cases:
+        for scrubber_name, scrubber in (("legacy", legacy_scrub_comments), ("current", scrub_comments)):
+            seconds = min(timeit.repeat(lambda: scrubber(content), number=1, repeat=3))
+            print("%-22s %-8s %10.4f" % (name, scrubber_name, seconds))
+
+if __name__ == '__main__':
+    run()
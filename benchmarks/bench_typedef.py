@@ -0,0 +1,75 @@
+# times parsers/typedef.py against the two regex typedef parsers it replaced, on a header with 10k
+# typedefs of every shape: plain, generic, block, function pointer and struct bodies, with methods
+# in between. run with: python -m benchmarks.bench_typedef [typedef count]
+import random
+import re
+import sys
+import timeit
+
+from parsers import typedef, utils
+
+# the original: two branches, each with a lookahead to the next ";" from every "typedef"
+ORIGINAL_RE = re.compile(r'typedef[^\(]*\([^\^]*\^\s*([A-Za-z]\w*)(?=[^;]*;)|typedef.*?([A-Za-z]\w*)(?=\W*;)')
+# one statement at a time, but with no idea of bodies or function pointers
+STATEMENT_RE = re.compile(r'typedef[^;]*;')
+STATEMENT_BLOCK_RE = re.compile(r'[^\(]*\([^\^]*\^\s*([A-Za-z]\w*)', re.ASCII)
+STATEMENT_NAME_RE = re.compile(r'(\w+)\W*;\Z', re.ASCII)
+
+def original(content):
+    return [group for match in ORIGINAL_RE.finditer(content) for group in match.groups() if group]
+
+def statement(content):
+    names = []
+    for match in STATEMENT_RE.finditer(content, 0, content.rfind(";") + 1):
+        block = STATEMENT_BLOCK_RE.match(content, match.start() + len("typedef"), match.end())
+        if block:
+            names.append(block.group(1))
+            continue
+        name = STATEMENT_NAME_RE.search(content, match.start() + len("typedef"), match.end())
+        if name and "\n" not in content[match.start():name.start(1)]:
+            names.append(name.group(1))
+    return names
+
+# (declaration, typedef name) for each shape. struct typedefs are named by the struct parser
+SHAPES = [
+    ("typedef NSInteger YPCount%d;\n", "YPCount%d"),
+    ("typedef NSArray<YPItem *> *YPItemList%d;\n", "YPItemList%d"),
+    ("typedef void (^YPCompletion%d)(NSArray *items, NSError *error);\n", "YPCompletion%d"),
+    ("typedef void (*YPCallback%d)(int value);\n", "YPCallback%d"),
+    ("typedef struct {\n  CGFloat width;\n  CGFloat height;\n} YPSize%d;\n", None),
+    ("- (void)loadItem:(NSInteger)index completion:(void (^)(BOOL finished))completion%d;\n", None),
+]
+
+def make_header(count, rng):
+    # (content, expected names)
+    parts = []
+    names = set()
+    for i in range(count):
+        declaration, name = rng.choice(SHAPES)
+        parts.append(declaration % i)
+        if name:
+            names.add(name % i)
+    return "".join(parts), names
+
+def run(count):
+    content, expected = make_header(count, random.Random(0))
+    content = utils.scrub(content)
+    header = utils.Header(content)
+    parsers = [
+        ("original", lambda: original(content)),
+        ("statement", lambda: statement(content)),
+        ("current", lambda: typedef.parse.symbols(utils.Header(content))),
+        # as search.py runs it, with the brace blocks already scanned for the enum and struct parsers
+        ("current+blocks", lambda: typedef.parse.symbols(header)),
+    ]
+    header.blocks()
+    print("%d typedefs, %d KB" % (count, len(content) // 1024))
+    print("%d typedef names expected" % len(expected))
+    print("%-16s %10s %10s %10s" % ("parser", "seconds", "names", "correct"))
+    for name, parse in parsers:
+        seconds = min(timeit.repeat(parse, number=1, repeat=5))
+        names = [getattr(found, 'name', found) for found in parse()]
+        print("%-16s %10.4f %10d %10d" % (name, seconds, len(names), len(expected.intersection(names))))
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,81 @@
+# times the enum, struct and typedef parsers on inputs built to make a backtracking regex go
+# quadratic: unclosed braces, forward declarations with no body and typedefs with no ";", plus
+# random soups of the same fragments from fixed seeds. every case has to stay under
+# MAX_SECONDS_PER_KB, and doubling the input has to roughly double the time.
+# run with: python -m benchmarks.bench_worst_case [KB]
+import random
+import sys
+import timeit
+
+from parsers import enum, struct, typedef
+
+MAX_SECONDS_PER_KB = 0.001
+
+def repeat_to(line, size):
+    # line % i repeated until the result is at least size bytes
+    lines = []
+    length = 0
+    i = 0
+    while length < size:
+        lines.append(line % i)
+        length += len(lines[-1])
+        i += 1
+    return "".join(lines)
+
+CASES = [
+    ("unclosed enum", enum, lambda size: "enum {\n" + repeat_to("  YPValue%d = 1 << 2,\n", size)),
+    ("NS_ENUM forwards", enum, lambda size: repeat_to("typedef NS_ENUM(NSInteger, YPType%d);\n", size)),
+    ("large enum", enum, lambda size: "typedef NS_ENUM(NSInteger, YPType) {\n" + repeat_to("  YPType%d,\n", size) + "};\n"),
+    ("unclosed struct", struct, lambda size: "typedef struct {\n" + repeat_to("  unsigned int flag%d : 1;\n", size)),
+    ("nested closes", struct, lambda size: "typedef struct {" * (size // 17) + "}" * (size // 17) + ";"),
+    ("struct forwards", struct, lambda size: repeat_to("struct YPStruct%d;\n", size)),
+    ("unended typedefs", typedef, lambda size: repeat_to("typedef void (*YPFunction%d)(int value)\n", size)),
+    ("long typedef line", typedef, lambda size: "typedef " + repeat_to("YPWord%d ", size)),
+]
+
+# the pieces of enum, struct and typedef declarations the fuzzed cases are put together from, in any
+# order, so braces, parentheses and statements are left open and closed at random
+FRAGMENTS = [
+    "{", "}", "};\n", ";", "(", ")", ",", " : 1", " = 1 << 2", "\n", " ", "*", "^", "#if 0\n", "#endif\n",
+    "enum ", "struct ", "union ", "typedef ", "NS_ENUM(NSInteger, YPFuzz%d)", "NS_OPTIONS(NSUInteger, YPFuzz%d)",
+    "void (^YPFuzz%d)(int value)", "int (*YPFuzz%d)(void)", "YPFuzz%d ", "unsigned int YPFuzz%d",
+    "NS_SWIFT_NAME(YPFuzz%d)",
+]
+FUZZ_SEEDS = range(8)
+
+def fuzzed(seed):
+    def make_content(size):
+        rng = random.Random(seed)
+        pieces = []
+        length = 0
+        while length < size:
+            fragment = rng.choice(FRAGMENTS)
+            pieces.append(fragment % len(pieces) if "%d" in fragment else fragment)
+            length += len(pieces[-1])
+        return "".join(pieces)
+    return make_content
+
+FUZZ_CASES = [
+    ("fuzz %d %s" % (seed, parser.__name__.split(".")[-1]), parser, fuzzed(seed))
+    for seed in FUZZ_SEEDS for parser in (enum, struct, typedef)
+]
+
+def seconds_per_kb(parser, content):
+    seconds = min(timeit.repeat(lambda: parser.parse(content), number=1, repeat=3))
+    return seconds / (len(content) / 1024.0)
+
+def run(size):
+    failed = []
+    for name, parser, make_content in CASES + FUZZ_CASES:
+        small = seconds_per_kb(parser, make_content(size // 2))
+        large = seconds_per_kb(parser, make_content(size))
+        print("%-18s %5d KB: %.6f s/KB (%.1fx the s/KB at half the size)" % (name, size // 1024, large, large / small))
+        if large > MAX_SECONDS_PER_KB:
+            failed.append(name)
+    if failed:
+        print("over %.3f s/KB: %s" % (MAX_SECONDS_PER_KB, ", ".join(failed)))
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    exit(run(int(sys.argv[1]) * 1024 if len(sys.argv) > 1 else 256 * 1024))
@@ -0,0 +1,132 @@
+# deterministic generator for synthetic Objective-C headers and the sources that use them. the same
+# seed gives the same corpus on the same Python version.
+import os
+import random
+
+WORDS = [
+    "watch", "search", "review", "account", "business", "photo", "check", "user", "badge", "request",
+    "source", "filter", "section", "menu", "error", "location", "provider", "option", "button", "value",
+]
+TYPES = ["NSInteger", "NSUInteger", "CGFloat", "BOOL", "NSString *", "NSArray *", "NSDictionary *", "id"]
+
+def camel(rng, count):
+    return "".join(rng.choice(WORDS).capitalize() for _ in range(count))
+
+def comment(rng):
+    # a mix of doc comments, line comments and a commented out declaration with braces and ";"s
+    words = [rng.choice(WORDS) for _ in range(rng.randint(8, 40))]
+    choice = rng.randint(0, 2)
+    if choice == 0:
+        return "/*!\n @brief %s\n @discussion %s\n */\n" % (" ".join(words[:6]), " ".join(words))
+    if choice == 1:
+        return "".join("// %s\n" % " ".join(words[i:i + 8]) for i in range(0, len(words), 8))
+    return "/*\ntypedef struct {\n  int %s;\n} Old%s;\n*/\n" % (rng.choice(WORDS), camel(rng, 2))
+
+def define(rng, name):
+    names = ["k%s%s" % (name, camel(rng, 2))]
+    return "#define %s %d\n" % (names[0], rng.randint(0, 1000)), names
+
+def ns_enum(rng, name):
+    macro = rng.choice(["NS_ENUM", "NS_OPTIONS"])
+    type_name = "%s%s" % (name, camel(rng, 1))
+    constants = ["%s%s" % (type_name, camel(rng, 2)) for _ in range(rng.randint(3, 12))]
+    values = ["1 << %d" % i if macro == "NS_OPTIONS" else str(i) for i in range(len(constants))]
+    body = "".join("  %s = %s, // %s\n" % (constant, value, rng.choice(WORDS)) for constant, value in zip(constants, values))
+    return "typedef %s(NSInteger, %s) {\n%s};\n" % (macro, type_name, body), [type_name] + constants
+
+def struct(rng, name):
+    type_name = "%s%sOptions" % (name, camel(rng, 1))
+    fields = ["%s%s" % (rng.choice(WORDS), camel(rng, 1)) for _ in range(rng.randint(2, 8))]
+    body = "".join("  unsigned int %s : 1;\n" % field for field in fields)
+    return "typedef struct {\n%s} %s;\n" % (body, type_name), [type_name] + fields
+
+def block_typedef(rng, name):
+    type_name = "%s%sBlock" % (name, camel(rng, 1))
+    return "typedef void (^%s)(%s value, NSError *error);\n" % (type_name, rng.choice(TYPES)), [type_name]
+
+def constant(rng, name):
+    names = ["%s%sNotification" % (name, camel(rng, 2))]
+    return "extern NSString *const %s;\n" % names[0], names
+
+def function(rng, name):
+    names = ["%s%s" % (name, camel(rng, 2))]
+    return "%s %s(%s value);\n" % (rng.choice(TYPES), names[0], rng.choice(TYPES)), names
+
+def methods(rng, count):
+    return "".join(
+        "- (%s)%s%s:(%s)value;\n" % (rng.choice(TYPES), rng.choice(WORDS), camel(rng, 1), rng.choice(TYPES))
+        for _ in range(count)
+    )
+
+def protocol(rng, name):
+    names = ["%s%sDelegate" % (name, camel(rng, 1))]
+    return "@protocol %s <NSObject>\n%s@end\n" % (names[0], methods(rng, rng.randint(1, 6))), names
+
+def interface(rng, name):
+    names = ["%s%s" % (name, camel(rng, 1))]
+    ivars = "".join("  %s _%s;\n" % (rng.choice(TYPES), rng.choice(WORDS)) for _ in range(rng.randint(0, 5)))
+    properties = "".join(
+        "@property (%s, nonatomic) %s %s;\n" % (rng.choice(["copy", "strong", "assign"]), rng.choice(TYPES), rng.choice(WORDS))
+        for _ in range(rng.randint(1, 6))
+    )
+    return "@interface %s : NSObject {\n%s}\n%s%s@end\n" % (names[0], ivars, properties, methods(rng, rng.randint(1, 10))), names
+
+# (weight, generator) for each kind of declaration
+DECLARATIONS = [
+    (4, define),
+    (3, ns_enum),
+    (1, struct),
+    (2, block_typedef),
+    (3, constant),
+    (2, function),
+    (1, protocol),
+    (2, interface),
+]
+
+def pick(rng):
+    roll = rng.uniform(0, sum(weight for weight, _ in DECLARATIONS))
+    for weight, generator in DECLARATIONS:
+        roll -= weight
+        if roll <= 0:
+            return generator
+    return DECLARATIONS[-1][1]
+
+def generate_header(rng, name, size):
+    # (content, declared names) for a header of at least size bytes
+    parts = ["// %s.h\n#import <Foundation/Foundation.h>\n\n" % name]
+    names = []
+    length = len(parts[0])
+    while length < size:
+        if rng.random() < 0.3:
+            parts.append(comment(rng))
+            length += len(parts[-1])
+        declaration, declared = pick(rng)(rng, name)
+        parts.append(declaration + "\n")
+        names.extend(declared)
+        length += len(parts[-1])
+    return "".join(parts), names
+
+def generate_source(rng, name, names):
+    # an implementation that uses about half of its header's names, so --dead has something to find
+    used = [declared for declared in names if rng.random() < 0.5]
+    body = "".join("    [self use:%s];\n" % declared for declared in used)
+    return '#import "%s.h"\n\n@implementation %sUser\n- (void)run {\n%s}\n@end\n' % (name, name, body)
+
+def write_corpus(directory, files, size, seed=0, sources=True):
+    # files headers of about size bytes each, 100 to a directory, each with a .m next to it when
+    # sources is set. returns the total number of header bytes written
+    rng = random.Random(seed)
+    total = 0
+    for i in range(files):
+        subdirectory = os.path.join(directory, "Module%d" % (i // 100))
+        if i % 100 == 0 and not os.path.isdir(subdirectory):
+            os.makedirs(subdirectory)
+        name = "YP%s%d" % (camel(rng, 1), i)
+        content, names = generate_header(rng, name, size)
+        with open(os.path.join(subdirectory, name + ".h"), 'w') as header:
+            header.write(content)
+        total += len(content)
+        if sources:
+            with open(os.path.join(subdirectory, name + ".m"), 'w') as source:
+                source.write(generate_source(rng, name, names))
+    return total
@@ -0,0 +1,122 @@
+# times comment scrubbing, every module in parsers/ and search.main end to end on generated corpora
+# (see benchmarks/corpus.py), and compares the results with a stored baseline. timings only compare
+# meaningfully against a baseline recorded on the same machine and Python version.
+# run with: python -m benchmarks.suite [--full] [--update-baseline] [--threshold 0.25]
+import argparse
+import importlib
+import json
+import os
+import pkgutil
+import random
+import shutil
+import sys
+import tempfile
+import timeit
+
+import parsers
+import search
+from benchmarks import corpus
+from parsers import utils
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+KB = 1024
+MB = 1024 * KB
+# (header sizes, (files, bytes per file) trees) for the default and the --full run
+QUICK = ([1 * KB, 100 * KB, 1 * MB], [(100, 4 * KB), (1000, 4 * KB)])
+FULL = ([1 * KB, 100 * KB, 1 * MB, 10 * MB], [(100, 4 * KB), (1000, 4 * KB), (10000, 4 * KB), (100000, 4 * KB)])
+# timings shorter than this are repeated in a loop so timer resolution doesn't dominate
+MIN_SECONDS = 0.05
+
+def parser_modules():
+    names = sorted(name for _, name, _ in pkgutil.iter_modules(parsers.__path__) if name != 'utils')
+    return [(name, importlib.import_module('parsers.' + name)) for name in names]
+
+def best_of(func, repeat=3):
+    # seconds for one call, the best of repeat runs
+    seconds = timeit.timeit(func, number=1)
+    number = max(1, int(MIN_SECONDS / seconds)) if seconds else 100
+    if number > 1 or repeat > 1:
+        seconds = min(timeit.repeat(func, number=number, repeat=repeat)) / number
+    return seconds
+
+def size_label(size):
+    return "%dMB" % (size // MB) if size >= MB else "%dKB" % (size // KB)
+
+def bench_parsers(sizes):
+    results = {}
+    for size in sizes:
+        content, _ = corpus.generate_header(random.Random(size), "YPBench", size)
+        repeat = 1 if size >= 10 * MB else 3
+        results["scrub/%s" % size_label(size)] = best_of(lambda: utils.scrub_comments(content), repeat)
+        scrubbed = utils.scrub_comments(content)
+        for name, module in parser_modules():
+            # a Header per call: it caches the brace scan and the newline index, which a shared one
+            # would only time on the first run
+            results["parse/%s/%s" % (name, size_label(size))] = best_of(
+                lambda: module.parse.symbols(utils.Header(scrubbed)), repeat
+            )
+    return results
+
+def run_main(argv):
+    saved_argv, saved_stdout = sys.argv, sys.stdout
+    with open(os.devnull, 'w') as devnull:
+        sys.argv, sys.stdout = ['search.py'] + argv, devnull
+        try:
+            search.main()
+        finally:
+            sys.argv, sys.stdout = saved_argv, saved_stdout
+
+def bench_search(trees):
+    results = {}
+    for files, size in trees:
+        directory = tempfile.mkdtemp()
+        try:
+            corpus.write_corpus(directory, files, size)
+            argv = [directory, '--no-cache', '--dead', '--jobs', '1']
+            results["search/%dfiles" % files] = best_of(lambda: run_main(argv), 1 if files >= 10000 else 3)
+        finally:
+            shutil.rmtree(directory)
+    return results
+
+def compare(results, baseline, threshold):
+    # names of the results more than threshold slower than the baseline
+    regressions = []
+    for name in sorted(results):
+        if name not in baseline:
+            print("%-28s %10.5f s  (no baseline)" % (name, results[name]))
+            continue
+        ratio = results[name] / baseline[name]
+        print("%-28s %10.5f s  %5.2fx baseline" % (name, results[name], ratio))
+        if ratio > 1 + threshold:
+            regressions.append(name)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Parser and search.py benchmarks')
+    parser.add_argument('--full', action="store_true", help="include 10MB headers and trees of up to 100k files")
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--update-baseline', action="store_true", help="record this run as the new baseline")
+    parser.add_argument('--threshold', type=float, default=0.25, help="allowed slowdown before a result counts as a regression")
+    args = parser.parse_args()
+
+    sizes, trees = FULL if args.full else QUICK
+    results = bench_parsers(sizes)
+    results.update(bench_search(trees))
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+    regressions = compare(results, baseline, args.threshold)
+    if args.update_baseline:
+        baseline.update(results)
+        with open(args.baseline, 'w') as baseline_file:
+            json.dump(baseline, baseline_file, indent=2, sort_keys=True)
+        return 0
+    if regressions:
+        print("regressed by more than %d%%: %s" % (args.threshold * 100, ", ".join(regressions)))
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    exit(main())
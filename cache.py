@@ -0,0 +1,193 @@
+from collections import defaultdict
+from queue import Queue
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from parsers.utils import Symbol
+
+CACHE_DIR = '.objc-dead-code-cache'
+PARSERS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'parsers')
+# bump when the shape of what get_symbols returns changes
+FORMAT_VERSION = 4
+# in-memory buffers have no path to check for, so their entries go once they haven't been used for
+# this long
+BUFFER_MAX_AGE = 30 * 24 * 60 * 60
+
+def parser_version(parsers):
+    # any edit to a module in parsers/ (or a change to which parsers run) invalidates every entry
+    digest = hashlib.sha1(str(FORMAT_VERSION).encode('utf-8'))
+    for parser in parsers:
+        digest.update(parser.__name__.encode('utf-8'))
+    for filename in sorted(os.listdir(PARSERS_DIR)):
+        if filename.endswith('.py'):
+            with open(os.path.join(PARSERS_DIR, filename), 'rb') as source:
+                digest.update(filename.encode('utf-8'))
+                digest.update(source.read())
+    return digest.hexdigest()
+
+def load_symbols(text):
+    # JSON turns aliases into a list, they go back to a tuple so symbols stay hashable
+    return [Symbol(*(row[:-1] + [tuple(row[-1])])) for row in json.loads(text)]
+
+def content_digest(path):
+    with open(path, 'rb') as source:
+        return hashlib.sha1(source.read()).hexdigest()
+
+def buffer_digest(content):
+    if not isinstance(content, bytes):
+        content = content.encode('utf-8')
+    return hashlib.sha1(content).hexdigest()
+
+def parse_queued(parse_many, misses, parsed):
+    # runs on a thread of its own, so parse_many (and the pool behind it) keeps going while the
+    # calling thread looks up the next items
+    try:
+        for result in parse_many(iter(misses.get, None)):
+            parsed.put(("result", result))
+    except BaseException as error:
+        parsed.put(("error", error))
+    parsed.put(("done", None))
+
+def overlap(lookups, parse_many):
+    # lookups yields a (miss, hit) pair per item it looks up in the cache, one of them None. hits
+    # are yielded straight away and misses queued for a single parse_many call, whose results are
+    # yielded as they come back, in between lookups. yields (result, hit) pairs. the lookups, and
+    # whatever the caller does with the results, stay on the calling thread, the only one a sqlite
+    # connection can be used from
+    misses = Queue()
+    parsed = Queue()
+    thread = threading.Thread(target=parse_queued, args=(parse_many, misses, parsed))
+    thread.daemon = True
+    thread.start()
+    finished = False
+    try:
+        for miss, hit in lookups:
+            if hit is None:
+                misses.put(miss)
+            else:
+                yield hit, True
+            while not parsed.empty():
+                state, result = parsed.get()
+                if state == "error":
+                    raise result
+                yield result, False
+        misses.put(None)
+        finished = True
+        while True:
+            state, result = parsed.get()
+            if state == "done":
+                return
+            if state == "error":
+                raise result
+            yield result, False
+    finally:
+        if not finished:
+            misses.put(None)
+
+class SymbolCache(object):
+    def __init__(self, cache_dir, version):
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+        self.version = version
+        self.connection = sqlite3.connect(os.path.join(cache_dir, 'symbols.sqlite'))
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS symbols "
+            "(path TEXT PRIMARY KEY, mtime REAL, size INTEGER, digest TEXT, version TEXT, symbols TEXT)"
+        )
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS buffers (digest TEXT PRIMARY KEY, used REAL, version TEXT, symbols TEXT)"
+        )
+        self.connection.execute("DELETE FROM symbols WHERE version != ?", (version,))
+        self.connection.execute("DELETE FROM buffers WHERE version != ?", (version,))
+
+    def lookup(self, path):
+        # returns (key, symbols). symbols is None on a miss, and key is what store() needs to record
+        # the entry once the header has been parsed
+        stat = os.stat(path)
+        row = self.connection.execute(
+            "SELECT mtime, size, digest, symbols FROM symbols WHERE path = ?", (path,)
+        ).fetchone()
+        if row is not None and row[0] == stat.st_mtime and row[1] == stat.st_size:
+            return None, load_symbols(row[3])
+        digest = content_digest(path)
+        if row is not None and row[2] == digest:
+            # touched but not changed, e.g. after a checkout
+            self.connection.execute(
+                "UPDATE symbols SET mtime = ?, size = ? WHERE path = ?", (stat.st_mtime, stat.st_size, path)
+            )
+            return None, load_symbols(row[3])
+        return (stat.st_mtime, stat.st_size, digest), None
+
+    def store(self, path, key, symbols):
+        mtime, size, digest = key
+        self.connection.execute(
+            "INSERT OR REPLACE INTO symbols VALUES (?, ?, ?, ?, ?, ?)",
+            (path, mtime, size, digest, self.version, json.dumps(symbols))
+        )
+
+    def evict(self):
+        paths = [row[0] for row in self.connection.execute("SELECT path FROM symbols")]
+        self.connection.executemany(
+            "DELETE FROM symbols WHERE path = ?", [(path,) for path in paths if not os.path.exists(path)]
+        )
+
+    def resolve(self, paths, parse_many):
+        # parse_many gets an iterator over the paths that missed and returns (path, symbols) pairs,
+        # like mapping get_symbols over them does. paths is consumed lazily, so misses are parsed
+        # while the walk is still going. a header that's gone by the time it's looked up is skipped.
+        # overlapping directories can yield a header twice, so every miss keeps its own key
+        keys = defaultdict(list)
+        def lookups():
+            for path in paths:
+                try:
+                    key, symbols = self.lookup(path)
+                except OSError:
+                    continue
+                if symbols is None:
+                    keys[path].append(key)
+                    yield path, None
+                else:
+                    yield None, (path, symbols)
+        for (path, symbols), hit in overlap(lookups(), parse_many):
+            if not hit:
+                pending = keys[path]
+                self.store(path, pending.pop(), symbols)
+                if not pending:
+                    del keys[path]
+            yield path, symbols
+        self.evict()
+        self.connection.commit()
+
+    def resolve_buffers(self, buffers, parse_many):
+        # resolve for (name, content) pairs that aren't files. entries are keyed by a digest of the
+        # content, so the same content is a hit under any name. parse_many gets an iterator over
+        # (index, content) pairs for the misses and returns (index, symbols) pairs
+        now = time.time()
+        pending = {}
+        def lookups():
+            for index, (name, content) in enumerate(buffers):
+                digest = buffer_digest(content)
+                row = self.connection.execute("SELECT symbols FROM buffers WHERE digest = ?", (digest,)).fetchone()
+                if row is None:
+                    pending[index] = name, digest
+                    yield (index, content), None
+                else:
+                    self.connection.execute("UPDATE buffers SET used = ? WHERE digest = ?", (now, digest))
+                    yield None, (name, load_symbols(row[0]))
+        for (key, symbols), hit in overlap(lookups(), parse_many):
+            if not hit:
+                key, digest = pending.pop(key)
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO buffers VALUES (?, ?, ?, ?)", (digest, now, self.version, json.dumps(symbols))
+                )
+            yield key, symbols
+        self.connection.execute("DELETE FROM buffers WHERE used < ?", (now - BUFFER_MAX_AGE,))
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
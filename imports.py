@@ -0,0 +1,200 @@
+from collections import defaultdict
+
+import os
+import re
+
+from parsers import utils
+
+# "#import "Foo.h"", "#include <Kit/Foo.h>" or "@import Kit.Foo;" on a line of its own
+IMPORT_RE = re.compile(
+    r"^[ \t]*(?:\#[ \t]*(?:import|include)[ \t]*[<\"]([^>\"\n]+)[>\"]|@import[ \t]+([\w.]+)[ \t]*;)",
+    re.MULTILINE | re.ASCII
+)
+
+# the files an import can name. C++ headers are in the graph so a .cpp or .mm that reaches an
+# Objective-C header through one isn't cut off from it
+HEADER_EXTENSIONS = {'.h', '.hpp'}
+
+def find_imports(string):
+    # the headers imported by already scrubbed text, as written. "@import Kit.Foo" is the header
+    # Kit/Foo.h, "@import Kit" the umbrella header Kit/Kit.h
+    names = []
+    for header, module in IMPORT_RE.findall(string):
+        if module:
+            parts = module.split(".")
+            header = "/".join(parts if len(parts) > 1 else parts * 2) + ".h"
+        names.append(header)
+    return names
+
+def imported_names(content):
+    # imports in comments and dead conditional code don't count
+    return find_imports(utils.scrub(content))
+
+def scan_imports(path):
+    with open(path, 'rb') as source:
+        return path, imported_names(source.read())
+
+class ImportGraph(object):
+    # which files import which headers in a tree, from (path, imported names) pairs as scan_imports
+    # returns them. see resolve for how a name is matched to headers. a name that matches several
+    # headers links to all of them, and a file with an import that points into the tree but can't be
+    # resolved is kept in opaque, so the graph never misses an edge. #import and #include are both
+    # recorded once per pair of files
+
+    def __init__(self, scanned):
+        scanned = list(scanned)
+        self._opaque_importers = None
+        self._prefixed = None
+        self._components = None
+        self._successors = None
+        self._reachable = {}
+        extensions = [os.path.splitext(path)[-1] for path, _ in scanned]
+        self.prefix_headers = {path for (path, _), extension in zip(scanned, extensions) if extension == '.pch'}
+        self.swift = {path for (path, _), extension in zip(scanned, extensions) if extension == '.swift'}
+        self.headers = defaultdict(list)
+        self.directories = set()
+        for path, _ in scanned:
+            if os.path.splitext(path)[-1] in HEADER_EXTENSIONS:
+                self.headers[os.path.basename(path)].append(path)
+            self.directories.update(os.path.dirname(path).split(os.sep))
+        self.imports = {}
+        self.importers = defaultdict(set)
+        self.opaque = set()
+        for path, names in scanned:
+            self.imports[path] = set()
+            for name in names:
+                headers = self.resolve(path, name)
+                if headers is None:
+                    self.opaque.add(path)
+                    continue
+                for header in headers:
+                    if header != path:
+                        self.imports[path].add(header)
+                        self.importers[header].add(path)
+
+    def resolve(self, path, name):
+        # the headers in the tree whose path ends with name, preferring one next to the importing
+        # file. failing that, every header with the same file name: a framework import such as
+        # <Kit/KitThing.h> doesn't say where in the tree the header lives (Kit/Classes/KitThing.h).
+        # [] when name isn't in the tree at all (system and SDK headers), and None when it points
+        # into a directory of the tree but at no header in it, e.g. "@import Kit" with the umbrella
+        # header generated from a module map. what such a file sees is unknown
+        name = os.path.normpath(name)
+        same_name = self.headers.get(os.path.basename(name), ())
+        candidates = [header for header in same_name if header == name or header.endswith(os.sep + name)]
+        if not candidates:
+            if same_name:
+                return list(same_name)
+            if os.sep in name and name.split(os.sep)[0] in self.directories:
+                return None
+            return []
+        local = os.path.normpath(os.path.join(os.path.dirname(path), name))
+        if local in candidates:
+            return [local]
+        return candidates
+
+    def transitive_importers(self, header):
+        # every file that sees header's declarations through a chain of imports, header included.
+        # not memoized: the pruning in search.py asks sees() instead, which never builds one
+        return frozenset(self._walk(self.importers, [header]))
+
+    def opaque_importers(self):
+        # the opaque files and every file that imports one, directly or not. any of them can see any
+        # header
+        if self._opaque_importers is None:
+            self._opaque_importers = frozenset(self._walk(self.importers, self.opaque))
+        return self._opaque_importers
+
+    def visible_everywhere(self, header):
+        # a prefix header (.pch) is compiled into every file, and so is everything it imports
+        if self._prefixed is None:
+            self._prefixed = frozenset(self._walk(self.imports, self.prefix_headers))
+        return header in self._prefixed
+
+    def sees(self, path, header):
+        # whether path can use header's declarations. Swift sees Objective-C through a bridging
+        # header set in the build settings, so .swift files always do
+        if path in self.swift or path in self.opaque_importers():
+            return True
+        return self._reaches(path, header)
+
+    def _reaches(self, path, header):
+        # whether a chain of imports leads from path to header, searched on the graph of strongly
+        # connected components. a component is numbered after every component it imports, so the
+        # search never has to enter one numbered below header's. answers are memoized per pair,
+        # which is bounded by the uses find_dead_symbols looks at rather than headers x files
+        if self._components is None:
+            self._condense()
+        start, target = self._components[path], self._components[header]
+        if start <= target:
+            return start == target
+        key = (start, target)
+        if key not in self._reachable:
+            found = False
+            seen = {start}
+            pending = [start]
+            while pending:
+                successors = self._successors[pending.pop()]
+                # an umbrella header finds target straight away instead of going through its imports
+                if target in successors:
+                    found = True
+                    break
+                for component in successors:
+                    if component > target and component not in seen:
+                        seen.add(component)
+                        pending.append(component)
+            self._reachable[key] = found
+        return self._reachable[key]
+
+    def _condense(self):
+        # tarjan's algorithm, without recursion so long import chains can't overflow the stack.
+        # components are numbered as they're completed, which is after everything they import
+        components = {}
+        order = {}
+        low = {}
+        stack = []
+        count = 0
+        for root in self.imports:
+            if root in order:
+                continue
+            order[root] = low[root] = len(order)
+            stack.append(root)
+            work = [(root, iter(self.imports[root]))]
+            while work:
+                path, imported = work[-1]
+                for header in imported:
+                    if header not in order:
+                        order[header] = low[header] = len(order)
+                        stack.append(header)
+                        work.append((header, iter(self.imports[header])))
+                        break
+                    if header not in components:
+                        low[path] = min(low[path], order[header])
+                else:
+                    work.pop()
+                    if work:
+                        low[work[-1][0]] = min(low[work[-1][0]], low[path])
+                    if low[path] == order[path]:
+                        while True:
+                            member = stack.pop()
+                            components[member] = count
+                            if member == path:
+                                break
+                        count += 1
+        self._components = components
+        self._successors = defaultdict(set)
+        for path, headers in self.imports.items():
+            for header in headers:
+                if components[header] != components[path]:
+                    self._successors[components[path]].add(components[header])
+
+    @staticmethod
+    def _walk(edges, starts):
+        seen = set(starts)
+        pending = list(seen)
+        while pending:
+            for following in edges.get(pending.pop(), ()):
+                if following not in seen:
+                    seen.add(following)
+                    pending.append(following)
+        return seen
@@ -0,0 +1,192 @@
+from fnmatch import fnmatch
+
+import os
+import sqlite3
+import subprocess
+
+INDEX_FILENAME = 'index.sqlite'
+# bump when the tables change, so an index from an older version is rebuilt
+FORMAT_VERSION = 2
+
+def git(root, *arguments):
+    return os.fsdecode(subprocess.check_output(('git', '-C', root) + arguments))
+
+def git_root(path):
+    return git(path, 'rev-parse', '--show-toplevel').strip()
+
+def head_revision(root):
+    return git(root, 'rev-parse', 'HEAD').strip()
+
+def changed_paths(root, revision):
+    # files that differ between revision and the working tree, plus untracked ones
+    names = git(root, 'diff', '--name-only', '-z', revision, '--').split('\0')
+    names += git(root, 'ls-files', '--others', '--exclude-standard', '-z').split('\0')
+    return {os.path.join(root, name) for name in names if name}
+
+def content_at_revision(root, revision, path):
+    # the file's bytes at revision, or None when it didn't exist there
+    try:
+        with open(os.devnull, 'w') as devnull:
+            return subprocess.check_output(
+                ('git', '-C', root, 'show', '%s:%s' % (revision, os.path.relpath(path, root))), stderr=devnull
+            )
+    except subprocess.CalledProcessError:
+        return None
+
+def in_scope(path, dirs, extensions, excludes):
+    if os.path.splitext(path)[-1] not in extensions:
+        return False
+    if not any(path.startswith(os.path.join(os.path.abspath(d), '')) for d in dirs):
+        return False
+    return not any(fnmatch(part, pattern) for part in path.split(os.sep) for pattern in excludes)
+
+class ReferenceIndex(object):
+    # persisted declarations (header -> symbol names, with the other names that count as using
+    # each, e.g. a property's setter) and references (file -> identifiers) for a whole tree,
+    # recorded against the git revision it was last synced to. files that were dirty at that point
+    # are flagged so the next sync re-reads them even if git no longer reports them
+
+    def __init__(self, cache_dir, version):
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+        self.connection = sqlite3.connect(os.path.join(cache_dir, INDEX_FILENAME))
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, dirty INTEGER);
+            CREATE TABLE IF NOT EXISTS declarations (name TEXT, path TEXT);
+            CREATE TABLE IF NOT EXISTS aliases (alias TEXT, name TEXT, path TEXT);
+            CREATE TABLE IF NOT EXISTS refs (identifier TEXT, path TEXT);
+            CREATE INDEX IF NOT EXISTS declarations_name ON declarations (name);
+            CREATE INDEX IF NOT EXISTS declarations_path ON declarations (path);
+            CREATE INDEX IF NOT EXISTS aliases_alias ON aliases (alias);
+            CREATE INDEX IF NOT EXISTS aliases_name ON aliases (name);
+            CREATE INDEX IF NOT EXISTS aliases_path ON aliases (path);
+            CREATE INDEX IF NOT EXISTS refs_identifier ON refs (identifier);
+            CREATE INDEX IF NOT EXISTS refs_path ON refs (path);
+        """)
+        version = "%d:%s" % (FORMAT_VERSION, version)
+        if self._meta('version') != version:
+            self.connection.executescript(
+                "DELETE FROM meta; DELETE FROM files; DELETE FROM declarations; DELETE FROM aliases; DELETE FROM refs;"
+            )
+            self._set_meta('version', version)
+
+    def _meta(self, key):
+        row = self.connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self.connection.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
+
+    @property
+    def revision(self):
+        return self._meta('revision')
+
+    def stale_paths(self, root):
+        # paths to re-read to bring the index up to date with the working tree, or None if the
+        # index has never been built
+        if self.revision is None:
+            return None
+        dirty = {row[0] for row in self.connection.execute("SELECT path FROM files WHERE dirty")}
+        return changed_paths(root, self.revision) | dirty
+
+    def update(self, path, declarations, identifiers):
+        # declarations are (name, aliases) pairs
+        self.remove(path)
+        declarations = dict(declarations)
+        self.connection.execute("INSERT INTO files VALUES (?, 0)", (path,))
+        self.connection.executemany("INSERT INTO declarations VALUES (?, ?)", [(name, path) for name in declarations])
+        self.connection.executemany("INSERT INTO aliases VALUES (?, ?, ?)", [
+            (alias, name, path) for name, aliases in declarations.items() for alias in set(aliases)
+        ])
+        self.connection.executemany("INSERT INTO refs VALUES (?, ?)", [(identifier, path) for identifier in identifiers])
+
+    def remove(self, path):
+        for table in ('files', 'declarations', 'aliases', 'refs'):
+            self.connection.execute("DELETE FROM %s WHERE path = ?" % table, (path,))
+
+    def mark_synced(self, root):
+        dirty = changed_paths(root, head_revision(root))
+        self.connection.execute("UPDATE files SET dirty = 0")
+        self.connection.executemany("UPDATE files SET dirty = 1 WHERE path = ?", [(path,) for path in dirty])
+        self._set_meta('revision', head_revision(root))
+        self.connection.commit()
+
+    def declared_in(self, path):
+        return {row[0] for row in self.connection.execute("SELECT name FROM declarations WHERE path = ?", (path,))}
+
+    def identifiers_in(self, path):
+        return {row[0] for row in self.connection.execute("SELECT identifier FROM refs WHERE path = ?", (path,))}
+
+    def declaring(self, name):
+        return {row[0] for row in self.connection.execute("SELECT path FROM declarations WHERE name = ?", (name,))}
+
+    def aliases_of(self, name, path):
+        return tuple(row[0] for row in self.connection.execute(
+            "SELECT alias FROM aliases WHERE name = ? AND path = ?", (name, path)
+        ))
+
+    def aliased(self, alias):
+        # the names alias counts as a use of
+        return {row[0] for row in self.connection.execute("SELECT name FROM aliases WHERE alias = ?", (alias,))}
+
+    def referencing(self, name):
+        return {row[0] for row in self.connection.execute("SELECT path FROM refs WHERE identifier = ?", (name,))}
+
+    def close(self):
+        self.connection.close()
+
+def changed_dead_symbols(index, root, revision, changed, parse_declarations, parse_references):
+    # compares the index (the working tree) with the tree at revision, where only the files in
+    # changed differ. returns ((symbol, header) pairs that became unused, pairs used again). only
+    # names declared or mentioned in a changed file can change status, so nothing else is looked at.
+    # a symbol is used if it or one of its aliases is, so a changed setter or instance variable
+    # makes its property a candidate too
+    before_declarations = {}
+    before_identifiers = {}
+    for path in changed:
+        content = content_at_revision(root, revision, path)
+        before_declarations[path] = dict(parse_declarations(path, content)) if content is not None else {}
+        before_identifiers[path] = parse_references(content) if content is not None else set()
+
+    identifiers = set()
+    for path in changed:
+        identifiers |= set(before_declarations[path]) | before_identifiers[path]
+        identifiers |= index.declared_in(path) | index.identifiers_in(path)
+    candidates = set(identifiers)
+    for identifier in identifiers:
+        candidates |= index.aliased(identifier)
+        candidates |= {
+            name for path in changed for name, aliases in before_declarations[path].items() if identifier in aliases
+        }
+
+    def used_now(names, header):
+        return any(index.referencing(name) - {header} for name in names)
+
+    def used_before(names, header):
+        for name in names:
+            referencing = (index.referencing(name) - changed) | {path for path in changed if name in before_identifiers[path]}
+            if referencing - {header}:
+                return True
+        return False
+
+    newly_dead = set()
+    revived = set()
+    for name in candidates:
+        headers = index.declaring(name)
+        headers_before = (headers - changed) | {path for path in changed if name in before_declarations[path]}
+        for header in headers | headers_before:
+            dead = dead_before = None
+            if header in headers:
+                dead = not used_now((name,) + index.aliases_of(name, header), header)
+            if header in headers_before:
+                if header in changed:
+                    aliases_before = tuple(before_declarations[header][name])
+                else:
+                    aliases_before = index.aliases_of(name, header)
+                dead_before = not used_before((name,) + aliases_before, header)
+            if dead and not dead_before:
+                newly_dead.add((name, header))
+            elif dead is False and dead_before:
+                revived.add((name, header))
+    return newly_dead, revived
@@ -0,0 +1,127 @@
+from array import array
+
+from parsers.utils import Symbol
+
+# strings are joined with it for the trip back from a pool worker, no name, kind or alias contains it
+SEPARATOR = "\0"
+# name, kind, line, column and offset
+ROW_WIDTH = 5
+
+def narrowest(values):
+    # array('H') halves the size of a header's rows when every line, column and offset in it fits
+    if values and max(values) > 0xffff:
+        return values
+    return array('H', values.tolist())
+
+def pack(symbols):
+    # a header's symbols as they're sent back from a pool worker: every distinct name, kind and
+    # alias once, joined into one string, and everything else as flat arrays of unsigned ints
+    # that index into it. rows has ROW_WIDTH ints per symbol, aliases a (row, alias) pair per alias
+    strings = {}
+    rows = array('I')
+    aliases = array('I')
+    for row, symbol in enumerate(symbols):
+        rows.extend((
+            strings.setdefault(symbol.name, len(strings)), strings.setdefault(symbol.kind, len(strings)),
+            symbol.line, symbol.column, symbol.offset,
+        ))
+        for alias in symbol.aliases:
+            aliases.extend((row, strings.setdefault(alias, len(strings))))
+    return SEPARATOR.join(strings), narrowest(rows), narrowest(aliases)
+
+def unpack(packed):
+    strings, rows, aliases = packed
+    strings = strings.split(SEPARATOR)
+    # a column at a time, so every Symbol is built by map rather than a loop in Python
+    symbols = list(map(
+        Symbol, map(strings.__getitem__, rows[0::ROW_WIDTH]), map(strings.__getitem__, rows[1::ROW_WIDTH]),
+        rows[2::ROW_WIDTH], rows[3::ROW_WIDTH], rows[4::ROW_WIDTH],
+    ))
+    symbol_aliases = {}
+    for row, alias in zip(aliases[0::2], aliases[1::2]):
+        symbol_aliases.setdefault(row, []).append(strings[alias])
+    for row, names in symbol_aliases.items():
+        symbols[row] = symbols[row]._replace(aliases=tuple(names))
+    return symbols
+
+class SymbolTable(object):
+    # the names of every header's symbols in a run, stored as columns: an array of name ids and one
+    # of kinds, one row per symbol, plus the first row of every header. names and aliases are
+    # interned, so a name declared in a thousand headers is one string and a thousand ints
+
+    def __init__(self):
+        self.strings = []
+        self.ids = {}
+        self.paths = []
+        self.starts = array('I')
+        # a handful of kinds, numbered separately so they fit a byte
+        self.kind_names = []
+        self.names = array('I')
+        self.kinds = array('B')
+        # name id -> alias ids
+        self.aliases = {}
+
+    def __len__(self):
+        return len(self.names)
+
+    def intern(self, string):
+        string_id = self.ids.get(string)
+        if string_id is None:
+            string_id = self.ids[string] = len(self.strings)
+            self.strings.append(string)
+        return string_id
+
+    def kind_id(self, kind):
+        if kind not in self.kind_names:
+            self.kind_names.append(kind)
+        return self.kind_names.index(kind)
+
+    def add(self, path, symbols):
+        self.paths.append(path)
+        self.starts.append(len(self.names))
+        for symbol in symbols:
+            name = self.intern(symbol.name)
+            self.names.append(name)
+            self.kinds.append(self.kind_id(symbol.kind))
+            if symbol.aliases:
+                self.aliases.setdefault(name, set()).update(map(self.intern, symbol.aliases))
+
+    def freeze(self):
+        # once every header is in, the lookup used to intern names is the biggest thing left in
+        # the table, and nothing after add() needs it
+        self.ids = None
+
+    def by_file(self, kinds=None):
+        # (path, names) for every header with symbols, in the order they were added. with kinds, only
+        # the names of those kinds, and only the headers that declare any
+        strings = self.strings
+        kind_ids = None if kinds is None else self._kind_ids(kinds)
+        ends = self.starts[1:].tolist() + [len(self.names)]
+        for path, start, end in zip(self.paths, self.starts, ends):
+            if kind_ids is None:
+                names = [strings[name] for name in self.names[start:end]]
+            else:
+                names = [strings[name] for name, kind in zip(self.names[start:end], self.kinds[start:end]) if kind in kind_ids]
+            if names:
+                yield path, names
+
+    def declared(self):
+        # every name that can be used, declared ones and their aliases
+        declared = {self.strings[name] for name in set(self.names)}
+        for alias_ids in self.aliases.values():
+            declared.update(self.strings[alias] for alias in alias_ids)
+        return declared
+
+    def alias_names(self):
+        # name -> aliases. a property declared in many headers has its aliases listed once
+        return {
+            self.strings[name]: tuple(sorted(self.strings[alias] for alias in alias_ids))
+            for name, alias_ids in self.aliases.items()
+        }
+
+    def names_of_kind(self, kinds):
+        kind_ids = self._kind_ids(kinds)
+        return {self.strings[name] for name, kind in zip(self.names, self.kinds) if kind in kind_ids}
+
+    def _kind_ids(self, kinds):
+        return {kind_id for kind_id, kind in enumerate(self.kind_names) if kind in kinds}
@@ -0,0 +1,70 @@
+from collections import deque
+
+from references import IDENTIFIER_RE
+
+# tokenizes the file once and does one hash lookup per identifier, so the cost per file doesn't
+# depend on how many symbols we're looking for
+class IdentifierMatcher(object):
+    def __init__(self, symbols):
+        self.symbols = frozenset(symbols)
+        # keyword selectors ("foo:bar:") are never identifiers, references.parse_references looks
+        # for them separately
+        self.selectors = frozenset(symbol for symbol in self.symbols if ":" in symbol)
+
+    def matches(self, content):
+        return self.symbols.intersection(IDENTIFIER_RE.findall(content))
+
+# matches symbols anywhere in the file, including inside larger tokens, for symbols that aren't
+# plain identifiers (e.g. selector fragments like "foo:bar:"). linear in the length of the file
+class AhoCorasickMatcher(object):
+    def __init__(self, symbols):
+        symbols = frozenset(symbols)
+        self.selectors = frozenset(symbol for symbol in symbols if ":" in symbol)
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [()]
+        for symbol in symbols:
+            self._add(symbol)
+        self._link()
+
+    def _add(self, symbol):
+        state = 0
+        for char in symbol:
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][char] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append(())
+            state = next_state
+        self.output[state] += (symbol,)
+
+    def _link(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                self.output[next_state] += self.output[self.fail[next_state]]
+
+    def matches(self, content):
+        goto, fail, output = self.goto, self.fail, self.output
+        found = set()
+        state = 0
+        for char in content:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+MATCHERS = {
+    'identifier': IdentifierMatcher,
+    'aho-corasick': AhoCorasickMatcher,
+}
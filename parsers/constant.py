@@ -1,41 +1,54 @@
 import re
-from parsers.utils import comments_scrubbed
+from parsers.utils import definition_blocks, symbol_parser
 
-CONSTANT_RE = re.compile(r".*?(\w+)[\s\=\d\.]*;")
+# finds the same names as the original per-line ".*?(\w+)[\s\=\d\.]*;". the first word that can end
+# a statement is where the lazy prefix would have stopped, and a match can never start mid-word when
+# it couldn't start at the beginning of that word, so \b stops the engine retrying every suffix.
+# the whitespace class leaves out "\n" so a match never spans two lines
+CONSTANT_RE = re.compile(r"\b(\w+)[ \t\r\f\v\=\d\.]*;", re.ASCII)
 
 # TODO: instead of this hack, we should really just import all the other parsers and exclude
 # symbols that they match from symbols that CONSTANT_RE matches
-def should_exclude_line(line):
-	return any([
-		"#" in line,
-		"typedef" in line,
-		"@" in line,
-		"}" in line,
-		"property" in line,
-		"+" in line,
-		"-" in line,
-		"(" in line,
-		":" in line # for structs e.g. unsigned int appendUnits : 1;
-	])
+EXCLUDED_LINE_RE = re.compile(
+	r"[#@}+\-(:]"  # ":" is for structs e.g. unsigned int appendUnits : 1;
+	r"|typedef"
+	r"|property"
+)
 
-OBJC_AT_KEYWORDS = {
-	"@interface", "@protocol", "@implementation"
-}
+def parse_lines(header, start, end, symbols):
+	# start is always the beginning of a line. lines are only looked at when CONSTANT_RE finds
+	# something on them
+	content = header.content
+	line_end = start
+	for match in CONSTANT_RE.finditer(content, start, end):
+		name, offset = match.group(1), match.start(1)
+		if offset >= line_end:
+			# rfind gives -1 on the first line of the segment, which isn't the start of the file
+			line_start = max(content.rfind("\n", start, offset) + 1, start)
+			line_end = content.find("\n", offset, end)
+			if line_end == -1:
+				line_end = end
+			excluded = EXCLUDED_LINE_RE.search(content, line_start, line_end) is not None
+			seen = set()
+		if excluded or name in seen:
+			continue
+		seen.add(name)
+		symbols.append(header.symbol(name, "constant", offset))
 
-@comments_scrubbed
-def parse(content):
-	lines = content.splitlines()
+@symbol_parser
+def parse(header):
+	content = header.content
 	symbols = []
+	position = 0
 
-	in_at_definition = False
-
-	for line in lines:
-		if any(keyword in line for keyword in OBJC_AT_KEYWORDS):
-			in_at_definition = True
-		if should_exclude_line(line) or in_at_definition:
-			continue
-		symbols.extend(list(set(CONSTANT_RE.findall(line))))
-		if "@end" in line:
-			in_at_definition = False
+	# everything between an @ definition and its @end is skipped in one jump
+	for _, start, end in definition_blocks(content):
+		definition_line = content.rfind("\n", 0, start) + 1
+		parse_lines(header, position, definition_line, symbols)
+		position = content.find("\n", end)
+		if position == -1:
+			return symbols
+		position += 1
 
+	parse_lines(header, position, len(content), symbols)
 	return symbols
\ No newline at end of file
@@ -1,8 +1,8 @@
 import re
-from parsers.utils import comments_scrubbed
+from parsers.utils import symbol_parser, unique_symbols
 
-DEFINE_RE = re.compile(r"\#define\s+(\w+).*?\n*")
+DEFINE_RE = re.compile(r"\#define\s+(\w+).*?\n*", re.ASCII)
 
-@comments_scrubbed
-def parse(content):
-	return list(set(DEFINE_RE.findall(content)))
\ No newline at end of file
+@symbol_parser
+def parse(header):
+	return unique_symbols(header, DEFINE_RE, "define")
\ No newline at end of file
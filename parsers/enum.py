@@ -1,37 +1,25 @@
-from itertools import chain
 from parsers import utils
 
 import re
 
-ENUM_CONTENT_RE = re.compile(r'([A-Za-z]\w*)')
-NS_ENUM_RE = re.compile(r'NS_ENUM[^\(]*?\(\W*?\w+[^,]*?,\W*?(\w+)[^\)]*?\)[^\{]*?\{([^\}]+?)}[^;]*?;')
-NS_OPTIONS_RE = re.compile(r'NS_OPTIONS[^\(]*?\(\W*?\w+[^,]*?,\W*?(\w+)[^\)]*?\)[^\{]*?\{([^\}]+?)}[^;]*?;')
-ENUM_RE = re.compile(r'enum[^\{]*?\{([^\}]+?)}\W*?(?:(\w+)\W*)?;')
+ENUM_CONTENT_RE = re.compile(r'([A-Za-z]\w*)', re.ASCII)
 
-def get_enum_content_symbols(enum_content):
+def get_enum_content_symbols(header, enum_content, start):
+    # scrub_preprocessor keeps offsets, so start + the offset within the content is the offset
+    # within the header
     enum_content = utils.scrub_preprocessor(enum_content)
     finditer = ENUM_CONTENT_RE.finditer(enum_content)
-    return [m.group(1) for m in finditer]
+    return [header.symbol(m.group(1), "enum_constant", start + m.start(1)) for m in finditer]
 
-def enum_match_iter(content, regexpr, old_style):
-    for match in regexpr.finditer(content):
-        if match:
-            match_content = (match.group(1), match.group(2))
-            if old_style:
-                match_content = tuple(reversed(match_content))
-            yield match_content
-
-@utils.comments_scrubbed
-def parse(content):
+@utils.symbol_parser
+def parse(header):
     symbols = []
-    enum_iter = chain(enum_match_iter(content, NS_ENUM_RE, False),
-                      enum_match_iter(content, NS_OPTIONS_RE, False),
-                      enum_match_iter(content, ENUM_RE, True))
-    for enum_symbol, enum_content in enum_iter:
-        if enum_symbol:
-            symbols.append(enum_symbol)
-        symbols.extend(get_enum_content_symbols(enum_content))
+    content = header.content
+    for block in header.blocks():
+        if block.kind not in ("enum", "options") or block.close - block.open < 2:
+            continue
+        if block.name:
+            symbols.append(header.symbol(block.name, "enum", block.name_offset))
+        symbols.extend(get_enum_content_symbols(header, content[block.open + 1:block.close], block.open + 1))
 
     return symbols
-
-
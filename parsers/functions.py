@@ -2,20 +2,103 @@ import re
 
 from parsers import utils
 
-FUNCTION_RE = re.compile(r'([\+\-@]*.*?)([A-Za-z]\w*)(?=\s*\([^\^])')
+# a preprocessor directive with its continuation lines, so a multi-line #define body is never
+# taken for code
+DIRECTIVE_RE = re.compile(r'^[ \t]*\#(?:\\\n|[^\n])*', re.MULTILINE)
+STATEMENT_DELIMITER_RE = re.compile(r'[;{}]')
+BRACE_RE = re.compile(r'[{}]')
+PARENTHESIS_RE = re.compile(r'[()]')
+# the head of an extern "C" { ... } block, whose body is still top level
+EXTERN_C_RE = re.compile(r'\s*extern\s*"C"\s*\Z')
 
+# words that make a statement anything but a declaration
 RESERVED_TOKENS = {
-	"@", "typedef", "#define", "while", "if", "switch"
+	"typedef", "return", "if", "else", "while", "for", "do", "switch", "case", "goto", "sizeof"
 }
 
-@utils.comments_scrubbed
-def parse(content):
+def matching_close(code, open_position, end, delimiter_re):
+    # offset of the bracket that closes the one at open_position, or None
+    depth = 0
+    for match in delimiter_re.finditer(code, open_position, end):
+        if match.group() in "({":
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return match.start()
+    return None
+
+def classify(code, start, end, definition):
+    # (kind, name match) for the top level statement code[start:end], or None when it isn't
+    # function-like. kind is "prototype", "inline" for a function with a body (definition) or
+    # "macro" for a statement that only invokes macros, "YP_SINGLETON(Foo)". a declaration can
+    # follow macro invocations, they're skipped over
+    macro = None
+    while True:
+        paren = code.find("(", start, end)
+        if paren == -1:
+            return None if macro is None else ("macro", macro)
+        words = list(utils.IDENTIFIER_RE.finditer(code, start, paren))
+        # the "(" has to follow a name: "void (^block)(void)" or a cast don't declare anything
+        if not words or code[words[-1].end():paren].strip():
+            return None
+        name = words[-1]
+        # "YP_SINGLETON(Foo)", or "NS_ASSUME_NONNULL_BEGIN YP_SINGLETON(Foo)" with no ";" in between
+        if len(words) > 1 and not all(utils.is_macro(word.group()) for word in words):
+            break
+        macro = macro or name
+        close = matching_close(code, paren, end, PARENTHESIS_RE)
+        if close is None:
+            return "macro", macro
+        start = close + 1
+    if any(word.group() in RESERVED_TOKENS for word in words) or utils.is_macro(name.group()):
+        return None
+    # "@class", "@property (...)" and variables with initializers
+    if code.find("@", start, paren) != -1 or code.find("=", start, paren) != -1:
+        return None
+    # a block or function pointer variable, "void (^name)(void)"
+    if code[paren + 1:end].lstrip()[:1] in ("^", "*"):
+        return None
+    return ("inline" if definition else "prototype"), name
+
+def statements(code, start, end):
+    # (start, end, definition) for every statement at brace depth 0 in code[start:end]. a "{" ends
+    # the declaration in front of it, and its body is skipped, unless it's an extern "C" block
+    statement_start = start
+    position = start
+    while True:
+        match = STATEMENT_DELIMITER_RE.search(code, position, end)
+        if match is None:
+            break
+        delimiter = match.group()
+        if delimiter == "{":
+            if EXTERN_C_RE.match(code, statement_start, match.start()):
+                position = statement_start = match.end()
+                continue
+            yield statement_start, match.start(), True
+            close = matching_close(code, match.start(), end, BRACE_RE)
+            if close is None:
+                return
+            position = statement_start = close + 1
+            continue
+        if delimiter == ";":
+            yield statement_start, match.start(), False
+        # a "}" at depth 0 closes an extern "C" block
+        position = statement_start = match.end()
+    yield statement_start, end, False
+
+@utils.symbol_parser
+def parse(header):
+    # functions are declared at the top level, so the bodies of @interface, @protocol and
+    # @implementation blocks, struct and enum bodies and preprocessor lines are never looked at
+    code = DIRECTIVE_RE.sub(utils.blank, header.content)
     symbols = []
-    for m in FUNCTION_RE.finditer(content):
-    	# if there's no match, or there is but we see a reserved word as the match or as part of the
-    	# string up to the match, we don't add the symbol. this filters out things like @property(...),
-    	# while(0) in #defines, etc
-        if not m.group(1) or (all([token not in m.group(1) and token != m.group(2) for token in RESERVED_TOKENS])):
-            symbols.append(m.group(2))
+    position = 0
+    segments = [(start, end + len("@end")) for _, start, end in utils.definition_blocks(code)]
+    for segment_end, next_position in segments + [(len(code), len(code))]:
+        for start, end, definition in statements(code, position, segment_end):
+            declaration = classify(code, start, end, definition)
+            if declaration is not None and declaration[0] != "macro":
+                symbols.append(header.symbol(declaration[1].group(), "function", declaration[1].start()))
+        position = next_position
     return symbols
-
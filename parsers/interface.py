@@ -1,8 +1,8 @@
 import re
-from parsers.utils import scrub_comments
+from parsers.utils import symbol_parser, unique_symbols
 
-INTERFACE_RE = re.compile(r"@interface\s*(\w+)\s*[:]")
+INTERFACE_RE = re.compile(r"@interface\s*(\w+)\s*[:]", re.ASCII)
 
-def parse(content):
-	scrubbed = scrub_comments(content)
-	return list(set(INTERFACE_RE.findall(scrubbed)))
+@symbol_parser
+def parse(header):
+	return unique_symbols(header, INTERFACE_RE, "interface")
@@ -0,0 +1,57 @@
+import re
+
+from parsers import utils
+
+# the attribute list, if there is one, and the rest of the declaration up to the ";"
+PROPERTY_RE = re.compile(r"@property\s*(?:\(([^()]*)\))?([^;]*);", re.ASCII)
+# the name of a block property, "void (^completion)(NSError *error)"
+BLOCK_NAME_RE = re.compile(r"\(\s*\^\s*([A-Za-z_]\w*)\s*\)", re.ASCII)
+# parenthesized attributes and availability macros after the name, e.g. NS_SWIFT_NAME(foo)
+PARENTHESIZED_RE = re.compile(r"\([^()]*\)")
+ACCESSOR_RE = re.compile(r"\b(getter|setter)\s*=\s*([A-Za-z_][\w:]*)", re.ASCII)
+READONLY_RE = re.compile(r"\breadonly\b", re.ASCII)
+
+def blank_parentheses(text):
+    # innermost groups first, until nested ones like __attribute__((deprecated)) are gone too
+    while True:
+        blanked = PARENTHESIZED_RE.sub(lambda m: " " * len(m.group()), text)
+        if blanked == text:
+            return text
+        text = blanked
+
+def property_name(declaration, start):
+    # (name, offset) of the property declared by the text after the attribute list, which starts
+    # at start in the header
+    block = BLOCK_NAME_RE.search(declaration)
+    if block:
+        return block.group(1), start + block.start(1)
+    # the name is the last identifier that isn't a trailing macro, e.g. NS_UNAVAILABLE or
+    # __deprecated. blanking keeps offsets
+    for match in reversed(list(utils.IDENTIFIER_RE.finditer(blank_parentheses(declaration)))):
+        if not utils.is_macro(match.group()):
+            return match.group(), start + match.start()
+    return None
+
+def accessors(name, attributes):
+    # the other names that use the property: a custom getter, the setter unless the property is
+    # readonly, and the synthesized instance variable
+    custom = dict(ACCESSOR_RE.findall(attributes))
+    aliases = []
+    if "getter" in custom:
+        aliases.append(custom["getter"])
+    if "setter" in custom:
+        aliases.append(custom["setter"])
+    elif not READONLY_RE.search(attributes):
+        aliases.append("set%s%s:" % (name[0].upper(), name[1:]))
+    aliases.append("_" + name)
+    return tuple(aliases)
+
+@utils.symbol_parser
+def parse(header):
+    symbols = []
+    for match in PROPERTY_RE.finditer(header.content):
+        attributes = match.group(1) or ""
+        name = property_name(match.group(2), match.start(2))
+        if name:
+            symbols.append(header.symbol(name[0], "property", name[1], accessors(name[0], attributes)))
+    return symbols
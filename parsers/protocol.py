@@ -1,8 +1,8 @@
 import re
-from parsers.utils import scrub_comments
+from parsers.utils import symbol_parser, unique_symbols
 
-PROTOCOL_RE = re.compile(r"@protocol\s*(\w+)\s*[:\<\s]")
+PROTOCOL_RE = re.compile(r"@protocol\s*(\w+)\s*[:\<\s]", re.ASCII)
 
-def parse(content):
-	scrubbed = scrub_comments(content)
-	return list(set(PROTOCOL_RE.findall(scrubbed)))
\ No newline at end of file
+@symbol_parser
+def parse(header):
+	return unique_symbols(header, PROTOCOL_RE, "protocol")
\ No newline at end of file
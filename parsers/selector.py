@@ -0,0 +1,39 @@
+import re
+
+from parsers import utils
+
+# a method declaration: its first keyword (or its whole name, when it takes no arguments) and
+# everything after it up to the ";" or "{". the return type is optional
+METHOD_RE = re.compile(r"^[ \t]*[-+][ \t]*(?:\([^;{]*?\))?\s*([A-Za-z_]\w*)([^;{]*)", re.MULTILINE | re.ASCII)
+# parentheses around argument types and attributes, and the keywords outside of them
+ARGUMENT_RE = re.compile(r"[()]|([A-Za-z_]\w*)\s*:", re.ASCII)
+
+def selector_name(name, arguments):
+    # "foo" for "- (void)foo;", "foo:bar:" for "- (void)foo:(int)a bar:(int)b;"
+    colon = arguments.lstrip()[:1] == ":"
+    if not colon:
+        return name
+    keywords = [name]
+    depth = 0
+    for match in ARGUMENT_RE.finditer(arguments):
+        if match.group() == "(":
+            depth += 1
+        elif match.group() == ")":
+            depth = max(depth - 1, 0)
+        elif depth == 0:
+            keywords.append(match.group(1))
+    return ":".join(keywords) + ":"
+
+@utils.symbol_parser
+def parse(header):
+    # methods declared in @interface and @protocol blocks, once per header
+    content = header.content
+    symbols = {}
+    for keyword, start, end in utils.definition_blocks(content):
+        if keyword == "implementation":
+            continue
+        for match in METHOD_RE.finditer(content, start, end):
+            name = selector_name(match.group(1), match.group(2))
+            if name not in symbols:
+                symbols[name] = header.symbol(name, "selector", match.start(1))
+    return list(symbols.values())
@@ -1,30 +1,47 @@
 from itertools import chain
+
 from parsers import utils
 
 import re
 
-STRUCT_RE = re.compile(r'struct[^\{]*?\{([^\}]+?)}\W*?(?:(\w+)\W*)?;')
-STRUCT_CONTENT_RE = re.compile(r'([A-Za-z]\w*)\s*[:]')
+STRUCT_CONTENT_RE = re.compile(r'([A-Za-z]\w*)\s*[:]', re.ASCII)
+# the blocks whose fields this parser reports. a union is reported like a struct, under its own kind
+FIELD_KINDS = {"struct", "union"}
 
-def get_struct_content_symbols(struct_content):
+def get_struct_content_symbols(header, struct_content, start):
     struct_content = utils.scrub_preprocessor(struct_content)
     finditer = STRUCT_CONTENT_RE.finditer(struct_content)
-    return [m.group(1) for m in finditer]
-
-def struct_match_iter(content, regexpr):
-    for match in regexpr.finditer(content):
-        if match:
-            match_content = (match.group(2), match.group(1))
-            yield match_content
-
-@utils.comments_scrubbed
-def parse(content):
+    return [header.symbol(m.group(1), "struct_field", start + m.start(1)) for m in finditer]
+
+def field_segments(block, skipped):
+    # (start, end) of the pieces of block's body outside the skipped (open, close) spans, in order
+    position = block.open + 1
+    for open_position, close_position in skipped:
+        yield position, open_position
+        position = close_position + 1
+    yield position, block.close
+
+@utils.symbol_parser
+def parse(header):
     symbols = []
-    for struct_symbol, struct_content in struct_match_iter(content, STRUCT_RE):
-        if struct_symbol:
-            symbols.append(struct_symbol)
-        symbols.extend(get_struct_content_symbols(struct_content))
+    content = header.content
+    # blocks come innermost first. finished holds the closed blocks that aren't inside a closed
+    # block yet, each with the spans of the bodies in it whose fields are already reported, so an
+    # outer body skips them instead of reporting nested fields twice
+    finished = []
+    for block in header.blocks():
+        nested = []
+        while finished and finished[-1][0].open > block.open:
+            nested.append(finished.pop())
+        skipped = list(chain.from_iterable(spans for _, spans in reversed(nested)))
+        finished.append((block, [(block.open, block.close)] if block.kind in FIELD_KINDS else skipped))
+        if block.kind not in FIELD_KINDS or block.close - block.open < 2:
+            continue
+        if block.name:
+            symbols.append(header.symbol(block.name, block.kind, block.name_offset))
+        for start, end in field_segments(block, skipped):
+            # every field has a ":", so pieces without one, like the head of a nested block, are skipped
+            if content.find(":", start, end) != -1:
+                symbols.extend(get_struct_content_symbols(header, content[start:end], start))
 
     return symbols
-
-
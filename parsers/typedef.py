@@ -2,11 +2,72 @@ import re
 
 from parsers import utils
 
-TYPEDEF_RE = re.compile(r'typedef[^\(]*\([^\^]*\^\s*([A-Za-z]\w*)(?=[^;]*;)|typedef.*?([A-Za-z]\w*)(?=\W*;)')
+# a typedef up to the ";" that ends it, or up to the "{" of a struct, union or enum body. the body
+# is skipped as a whole (enums are named by the enum parser, structs and unions by the struct
+# parser), so the whole header is read once, left to right, and a typedef can't pick up a name
+# from a later declaration
+TYPEDEF_RE = re.compile(r'\btypedef\b[^;{]*[;{]', re.ASCII)
+# a block or function pointer, "void (^Name)(...)" or "int (* _Nullable Name)(...)"
+POINTER_TYPEDEF_RE = re.compile(
+    r'[^(]*\(\s*(?:[A-Za-z_]\w*\s+)*[\^*]\s*(?:[A-Za-z_]\w*\s+)*?([A-Za-z_]\w*)\s*\)\s*\(', re.ASCII
+)
+# the words in front of the first "(" of anything else
+CALL_RE = re.compile(r'([^(]*)\(')
+# the last word before the ";", which has to be on the same line as the typedef keyword. matched
+# from the typedef keyword, the greedy .* finds it by backing up from the ";" instead of trying
+# every position in between
+TYPEDEF_NAME_RE = re.compile(r'.*\b(\w+)\W*;', re.ASCII | re.DOTALL)
+LETTER_RE = re.compile(r'[A-Za-z]')
 
-@utils.comments_scrubbed
-def parse(content):
+def from_letter(name, offset):
+    # names start at their first letter, so "_Foo" is "Foo"
+    letter = LETTER_RE.search(name)
+    if letter is None:
+        return None
+    return name[letter.start():], offset + letter.start()
+
+def typedef_name(content, start, end):
+    # (name, offset) of the typedef statement content[start:end], ending in its ";", or None
+    start += len("typedef")
+    call = None
+    if content.find("(", start, end) != -1:
+        pointer = POINTER_TYPEDEF_RE.match(content, start, end)
+        if pointer:
+            return from_letter(pointer.group(1), pointer.start(1))
+        call = CALL_RE.match(content, start, end)
+    if call:
+        words = list(utils.IDENTIFIER_RE.finditer(call.group(1)))
+        # "NSInteger Name NS_SWIFT_NAME(...)" or the function type "void Name(...)". a bare
+        # "NS_ENUM(NSInteger, Name)" falls through to the last word
+        if len(words) >= 3 and utils.is_macro(words[-1].group()):
+            return from_letter(words[-2].group(), start + words[-2].start())
+        if len(words) >= 2 and not utils.is_macro(words[-1].group()):
+            return from_letter(words[-1].group(), start + words[-1].start())
+    name = TYPEDEF_NAME_RE.match(content, start, end)
+    if name is None or "\n" in content[start:name.start(1)]:
+        return None
+    return from_letter(name.group(1), name.start(1))
+
+@utils.symbol_parser
+def parse(header):
     result = []
-    for match in TYPEDEF_RE.finditer(content):
-        result.extend([s for s in match.groups() if s])
+    content = header.content
+    # a "typedef" after the last ";" and "{" can't end, so the scan stops there
+    limit = max(content.rfind(";"), content.rfind("{")) + 1
+    closes = None
+    position = 0
+    while True:
+        match = TYPEDEF_RE.search(content, position, limit)
+        if match is None:
+            break
+        position = match.end()
+        if match.group().endswith("{"):
+            if closes is None:
+                closes = {block.open: block.close for block in header.blocks()}
+            # an unclosed body runs to the end of the header
+            position = closes.get(match.end() - 1, limit)
+            continue
+        name = typedef_name(content, match.start(), match.end())
+        if name:
+            result.append(header.symbol(name[0], "typedef", name[1]))
     return result
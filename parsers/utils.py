@@ -1,19 +1,312 @@
-﻿import re
+﻿from bisect import bisect_left
+from collections import namedtuple
+from itertools import chain
 
-SINGLE_LINE_RE = re.compile(r"\/\/.*\n")
-MULTI_LINE_RE = re.compile(r"\/\*.*?\*\/", re.DOTALL)
+import re
+
+# a comment. unterminated comments run to the end of the file, and the block comment pattern is
+# unrolled so nothing is ever rescanned. every match starts with a "/", which lets the regex engine
+# jump from one "/" to the next, but on its own it can't tell a comment from a comment marker
+# inside a literal ("http://...")
+COMMENT_RE = re.compile(r"(//[^\n]*|/\*[^*]*(?:\*+[^*/][^*]*)*(?:\*+/|\**\Z))", re.DOTALL)
+# a quote followed by a comment marker on the same line, or by a backslash continuing the line,
+# the only ways a literal can hide a marker. a string without any is split on COMMENT_RE. they're
+# two patterns so each keeps a one character prefix to jump to
+QUOTED_MARKER_RES = (
+    re.compile(r'"[^"\n]*(?:/[/*]|\\\n)'),
+    re.compile(r"'[^'\n]*(?:/[/*]|\\\n)"),
+)
+# the code and literals up to the next comment, and the comment, matched one after the other from
+# the start of the string. slower than COMMENT_RE since every character goes through the pattern,
+# but literals are skipped as a whole. unterminated literals run to the end of the line. the code
+# can only stop at a comment or the end of the string, so it never backtracks
+CODE_AND_COMMENT_RE = re.compile(r"""
+    ((?:[^/"']+
+      | /(?![/*])
+      | "[^"\\\n]*(?:\\.[^"\\\n]*)*"?
+      | '[^'\\\n]*(?:\\.[^'\\\n]*)*'?
+    )*)
+    (//[^\n]*
+    |/\*[^*]*(?:\*+[^*/][^*]*)*(?:\*+/|\**\Z))?
+""", re.DOTALL | re.VERBOSE | re.ASCII)
 PREPROCESSOR_RE = re.compile(r"\#.*\n")
+IDENTIFIER_RE = re.compile(r"[A-Za-z_]\w*", re.ASCII)
+MACRO_RE = re.compile(r"__\w*|[A-Z][A-Z0-9]*_[A-Z0-9_]*\Z", re.ASCII)
+BLOCK_DELIMITER_RE = re.compile(r"[{};]")
+# matched against the declaration in front of a block's "{", e.g. "typedef NS_ENUM(NSInteger, Foo) "
+NS_ENUM_RE = re.compile(r"(NS_ENUM|NS_OPTIONS)[^\(]*\(\W*\w+[^,]*,\W*(\w+)", re.ASCII)
+BLOCK_KEYWORD_RE = re.compile(r"\b(enum|struct|union)\b", re.ASCII)
+# the runs of text BlockNames looks at after a block's "}", e.g. "} YPVoteButtonType;"
+NON_WORD_RE = re.compile(r"\W*", re.ASCII)
+WORD_RE = re.compile(r"\w+", re.ASCII)
+# the directives scrub_inactive follows, with the rest of their line
+CONDITIONAL_RE = re.compile(r"^[ \t]*\#[ \t]*(if|ifdef|ifndef|elif|else|endif|define|undef)\b[ \t]*([^\n]*)", re.MULTILINE | re.ASCII)
+CONDITION_NAME_RE = re.compile(r"\w+", re.ASCII)
+# start of an @interface/@protocol/@implementation block, but not a forward declaration like
+# "@protocol Foo, Bar;"
+DEFINITION_RE = re.compile(r"@(interface|protocol|implementation)(?![\w \t,]*;)", re.ASCII)
+
+# every byte decodes to exactly one character in latin-1, so decoding never fails and offsets into
+# the decoded text are byte offsets into the file
+ENCODING = 'latin-1'
+
+# line and column are 1-based, offset is the 0-based byte offset into the header. aliases are other
+# names that count as a use of the symbol, e.g. a property's setter and instance variable
+Symbol = namedtuple('Symbol', ['name', 'kind', 'line', 'column', 'offset', 'aliases'], defaults=[()])
+
+# a {} block: prefix_start is where the declaration leading up to the "{" starts (just after the
+# previous "{", "}" or ";"), open and close are the offsets of the braces themselves. kind is
+# "enum", "options", "struct", "union" or "other", and name and name_offset are the type the block
+# declares, None when it's anonymous
+Block = namedtuple('Block', ['prefix_start', 'open', 'close', 'kind', 'name', 'name_offset'])
+
+def _blank_text(text):
+    if "\n" in text:
+        return "\n".join([" " * len(line) for line in text.split("\n")])
+    return " " * len(text)
+
+def blank(match):
+    # a re.sub replacement that blanks out the match and keeps offsets
+    return _blank_text(match.group())
+
+def is_macro(name):
+    # a macro such as NS_ENUM, NS_SWIFT_NAME or API_AVAILABLE, or a compiler keyword such as
+    # __attribute__ or __deprecated, rather than a name
+    return MACRO_RE.match(name) is not None
+
+def decode(content):
+    if isinstance(content, bytes):
+        return content.decode(ENCODING)
+    return content
+
+class _Blanks(dict):
+    # a str.translate table that turns everything but newlines (and NUL, see _blank_comments) into
+    # spaces
+    def __missing__(self, key):
+        return 32
+
+_BLANKS = _Blanks({0: 0, 10: 10})
+
+def _blank_comments(comments):
+    # one translate for all of them rather than a call per comment, unless one contains a NUL
+    joined = "\0".join(comments)
+    if joined.count("\0") != len(comments) - 1:
+        return [_blank_text(comment) for comment in comments]
+    return joined.translate(_BLANKS).split("\0")
 
 def scrub_comments(string):
-    result = SINGLE_LINE_RE.sub("\n", string)
-    result = MULTI_LINE_RE.sub("", result)
-    return result
+    # comments are blanked out with spaces rather than removed, so offsets into the scrubbed
+    # string are offsets into the original header. the string is cut into alternating code and
+    # comments, without any per comment work in python
+    if any(regex.search(string) for regex in QUOTED_MARKER_RES):
+        parts = list(chain.from_iterable(CODE_AND_COMMENT_RE.findall(string)))
+    else:
+        parts = COMMENT_RE.split(string)
+        if len(parts) == 1:
+            return parts[0]
+    parts[1::2] = _blank_comments(parts[1::2])
+    return "".join(parts)
 
 def scrub_preprocessor(string):
-    result = PREPROCESSOR_RE.sub("\n", string)
+    result = PREPROCESSOR_RE.sub(blank, string)
     return result
 
-def comments_scrubbed(func):
-    def scrub_and_call(string):
-        return func(scrub_comments(string))
-    return scrub_and_call
+def evaluate_condition(directive, condition, defined):
+    # True or False when the condition is a literal or tests a macro the header itself defined
+    # earlier, None for everything else since it depends on build settings we can't see
+    condition = condition.strip()
+    if directive in ("ifdef", "ifndef"):
+        name = CONDITION_NAME_RE.match(condition)
+        if name is None or name.group() not in defined:
+            return None
+        return directive == "ifdef"
+    while condition.startswith("(") and condition.endswith(")"):
+        condition = condition[1:-1].strip()
+    if condition.isdigit():
+        return int(condition) != 0
+    return None
+
+def scrub_inactive(string):
+    # blanks out the code in conditional branches that can never be compiled, e.g. "#if 0" or the
+    # "#else" of "#if 1". branches that depend on anything else are kept. each open conditional is
+    # [taken, current]: whether an earlier branch was taken and whether the current one is, with
+    # None for unknown
+    conditionals = []
+    defined = set()
+    pieces = []
+    position = 0
+    inactive_start = None
+    for match in CONDITIONAL_RE.finditer(string):
+        directive, rest = match.groups()
+        if directive in ("define", "undef"):
+            name = CONDITION_NAME_RE.match(rest)
+            if name is not None and inactive_start is None:
+                if directive == "undef":
+                    defined.discard(name.group())
+                elif all(current for _, current in conditionals):
+                    defined.add(name.group())
+            continue
+        if directive in ("if", "ifdef", "ifndef"):
+            value = evaluate_condition(directive, rest, defined)
+            conditionals.append([value, value])
+        elif not conditionals:
+            # an #else or #endif without its #if
+            continue
+        elif directive == "endif":
+            conditionals.pop()
+        else:
+            conditional = conditionals[-1]
+            taken = conditional[0]
+            value = True if directive == "else" else evaluate_condition(directive, rest, defined)
+            if taken:
+                conditional[1] = False
+            elif value is False:
+                conditional[1] = False
+            elif taken is False and value:
+                conditional[:] = [True, True]
+            else:
+                conditional[:] = [None, None]
+        inactive = any(current is False for _, current in conditionals)
+        if inactive and inactive_start is None:
+            inactive_start = match.end()
+        elif not inactive and inactive_start is not None:
+            pieces.append(string[position:inactive_start])
+            pieces.append(_blank_text(string[inactive_start:match.start()]))
+            position = match.start()
+            inactive_start = None
+    if inactive_start is not None:
+        pieces.append(string[position:inactive_start])
+        pieces.append(_blank_text(string[inactive_start:]))
+        position = len(string)
+    if not pieces:
+        return string
+    pieces.append(string[position:])
+    return "".join(pieces)
+
+def scrub(content):
+    # what every parser sees: the decoded header with comments and dead conditional code blanked out
+    return scrub_inactive(scrub_comments(decode(content)))
+
+class Header(object):
+    # scrubbed header content shared by every parser, plus the newline index used to turn match
+    # offsets into line and column numbers. the index is only built if a symbol is found
+
+    def __init__(self, content):
+        self.content = content
+        self._newlines = None
+        self._blocks = None
+
+    def blocks(self):
+        # every {} block, scanned and classified once no matter how many parsers ask
+        if self._blocks is None:
+            self._blocks = brace_blocks(self.content)
+        return self._blocks
+
+    def symbol(self, name, kind, offset, aliases=()):
+        if self._newlines is None:
+            self._newlines = [m.start() for m in re.finditer("\n", self.content)]
+        line_index = bisect_left(self._newlines, offset)
+        line_start = self._newlines[line_index - 1] + 1 if line_index else 0
+        return Symbol(name, kind, line_index + 1, offset - line_start + 1, offset, aliases)
+
+def read_header(path):
+    with open(path, 'rb') as header_file:
+        return Header(scrub(header_file.read()))
+
+class BlockNames(object):
+    # the name after a block's "}": the first word, if a ";" follows it with only non-word
+    # characters in between. a ";" before any word means an anonymous block, and no ";" at all that
+    # it isn't a type declaration. blocks are closed left to right, so the run of non-word
+    # characters after a "}" and the word after it are remembered for every "}" in the same run,
+    # and a run of nested closes, "}}}};", is scanned once rather than once per block
+
+    def __init__(self, string):
+        self.string = string
+        self._run_end = -1
+        self._semicolon = -1
+        self._word = None
+
+    def after(self, close_position):
+        # (name, offset), (None, None) for an anonymous block or None when there's no ";"
+        position = close_position + 1
+        string = self.string
+        if position >= self._run_end:
+            self._run_end = NON_WORD_RE.match(string, position).end()
+            self._semicolon = string.find(";", position, self._run_end)
+            self._word = None
+        elif self._semicolon != -1 and self._semicolon < position:
+            # only ever searched from further along the run than last time
+            self._semicolon = string.find(";", position, self._run_end)
+        if self._semicolon != -1:
+            return None, None
+        if self._word is None:
+            word = WORD_RE.match(string, self._run_end)
+            if word is None:
+                self._word = False
+            else:
+                following = NON_WORD_RE.match(string, word.end()).end()
+                self._word = string.find(";", word.end(), following) != -1 and (word.group(), word.start())
+        return self._word or None
+
+def classify_block(string, prefix_start, open_position, close_position, names=None):
+    # (kind, name, name offset). NS_ENUM and NS_OPTIONS name their type in the prefix, plain enums,
+    # structs and unions by a typedef name after the "}". brace_blocks shares one BlockNames
+    # between all the blocks of a header
+    ns_enum = NS_ENUM_RE.search(string, prefix_start, open_position)
+    if ns_enum:
+        kind = "options" if ns_enum.group(1) == "NS_OPTIONS" else "enum"
+        return kind, ns_enum.group(2), ns_enum.start(2)
+    keyword = BLOCK_KEYWORD_RE.search(string, prefix_start, open_position)
+    if keyword:
+        name = (names or BlockNames(string)).after(close_position)
+        if name:
+            return keyword.group(1), name[0], name[1]
+    return "other", None, None
+
+def brace_blocks(string):
+    # every closed {} block in one linear pass, innermost blocks first. a "{" that is never closed
+    # just never produces a block, instead of being searched to the end of the file
+    blocks = []
+    open_blocks = []
+    names = BlockNames(string)
+    delimiter = -1
+    for match in BLOCK_DELIMITER_RE.finditer(string):
+        position = match.start()
+        character = match.group()
+        if character == "{":
+            open_blocks.append((delimiter + 1, position))
+        elif character == "}" and open_blocks:
+            prefix_start, open_position = open_blocks.pop()
+            kind, name, name_offset = classify_block(string, prefix_start, open_position, position, names)
+            blocks.append(Block(prefix_start, open_position, position, kind, name, name_offset))
+        delimiter = position
+    return blocks
+
+def definition_blocks(string):
+    # (keyword, start, end) for every @interface, @protocol and @implementation, where start is the
+    # offset of its "@" and end the offset of its "@end", or the end of the string if there isn't one
+    position = 0
+    for match in DEFINITION_RE.finditer(string):
+        if match.start() < position:
+            continue
+        position = string.find("@end", match.end())
+        if position == -1:
+            position = len(string)
+        yield match.group(1), match.start(), position
+
+def unique_symbols(header, regexpr, kind):
+    # one symbol per distinct name captured by the first group of regexpr, at its first match
+    symbols = {}
+    for match in regexpr.finditer(header.content):
+        if match.group(1) not in symbols:
+            symbols[match.group(1)] = header.symbol(match.group(1), kind, match.start(1))
+    return list(symbols.values())
+
+def symbol_parser(func):
+    # func takes a Header and returns Symbols. the decorated parse() keeps the simple interface of
+    # taking raw header content and returning symbol names, and .symbols gives callers that share
+    # one Header between parsers (search.parse_content) the full records
+    def parse(string):
+        return [symbol.name for symbol in func(Header(scrub(string)))]
+    parse.symbols = func
+    return parse
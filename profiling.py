@@ -0,0 +1,108 @@
+from collections import namedtuple
+from timeit import default_timer
+
+import cProfile
+import heapq
+import json
+import pstats
+
+from parsers import utils
+
+# one step of parsing a header: "read" (reading and scrubbing comments) or a parser module
+Stage = namedtuple('Stage', ['name', 'seconds', 'bytes', 'symbols'])
+# stats is the raw cProfile stats dict for the header, or None when pstats weren't asked for
+FileProfile = namedtuple('FileProfile', ['path', 'stages', 'stats'])
+
+def parser_name(parser):
+    return parser.__name__.rsplit('.', 1)[-1]
+
+def profile_header(header_path, parsers, with_pstats=False):
+    # the same work as search.get_symbols, timed stage by stage. everything returned is plain data
+    # so it can be pickled back from a pool worker
+    profiler = cProfile.Profile() if with_pstats else None
+    if profiler:
+        profiler.enable()
+    start = default_timer()
+    header = utils.read_header(header_path)
+    stages = [Stage("read", default_timer() - start, len(header.content), 0)]
+    symbols = []
+    for parser in parsers:
+        start = default_timer()
+        found = parser.parse.symbols(header)
+        stages.append(Stage(parser_name(parser), default_timer() - start, len(header.content), len(found)))
+        symbols.extend(found)
+    stats = None
+    if profiler:
+        profiler.disable()
+        profiler.create_stats()
+        stats = profiler.stats
+    return header_path, symbols, FileProfile(header_path, stages, stats)
+
+class _RawStats(object):
+    # lets pstats.Stats load a stats dict that came back from another process
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+class RunProfile(object):
+    # FileProfiles from every worker, merged in the main process
+
+    def __init__(self):
+        self.files = []
+        self.stages = {}
+        self.stage_order = []
+        self.stats = None
+
+    def add(self, file_profile):
+        seconds = size = symbols = 0
+        for stage in file_profile.stages:
+            if stage.name not in self.stages:
+                self.stages[stage.name] = [0.0, 0, 0]
+                self.stage_order.append(stage.name)
+            totals = self.stages[stage.name]
+            totals[0] += stage.seconds
+            totals[1] += stage.bytes
+            totals[2] += stage.symbols
+            seconds += stage.seconds
+            symbols += stage.symbols
+            if stage.name == "read":
+                size = stage.bytes
+        self.files.append((seconds, size, symbols, file_profile.path))
+        if file_profile.stats is not None:
+            if self.stats is None:
+                self.stats = pstats.Stats(_RawStats(file_profile.stats))
+            else:
+                self.stats.add(_RawStats(file_profile.stats))
+
+    def slowest(self, top):
+        return heapq.nlargest(top, self.files)
+
+    def report(self, stream, top):
+        total = sum(totals[0] for totals in self.stages.values()) or 1.0
+        stream.write("%d headers parsed\n\n" % len(self.files))
+        stream.write("%-12s %10s %6s %10s %10s\n" % ("stage", "seconds", "%", "KB", "symbols"))
+        for name in self.stage_order:
+            seconds, size, symbols = self.stages[name]
+            stream.write("%-12s %10.4f %6.1f %10d %10d\n" % (name, seconds, 100 * seconds / total, size // 1024, symbols))
+        stream.write("\nslowest headers:\n")
+        for seconds, size, symbols, path in self.slowest(top):
+            stream.write("%10.4f s %8d KB %6d symbols  %s\n" % (seconds, size // 1024, symbols, path))
+
+    def write_json(self, path):
+        with open(path, 'w') as json_file:
+            json.dump({
+                'stages': [
+                    dict(zip(['name', 'seconds', 'bytes', 'symbols'], [name] + self.stages[name]))
+                    for name in self.stage_order
+                ],
+                'files': [
+                    {'path': path, 'seconds': seconds, 'bytes': size, 'symbols': symbols}
+                    for seconds, size, symbols, path in sorted(self.files, reverse=True)
+                ],
+            }, json_file, indent=2)
+
+    def dump_stats(self, path):
+        if self.stats is not None:
+            self.stats.dump_stats(path)
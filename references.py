@@ -0,0 +1,144 @@
+import re
+
+import imports
+from parsers import utils
+
+IDENTIFIER_RE = utils.IDENTIFIER_RE
+# the tokens the selector scan needs: the brackets, parentheses and braces that nest message sends,
+# "keyword:", @selector(...) and string and char literals, so brackets inside them are skipped.
+# \b keeps the engine from retrying "keyword:" at every position inside a word
+SELECTOR_TOKEN_RE = re.compile(r"""
+    ([][(){}])
+  | \b([A-Za-z_]\w*)\s*:(?!:)
+  | @selector\s*\(\s*([A-Za-z_][\w:]*)\s*\)
+  | "([^"\\\n]*(?:\\.[^"\\\n]*)*)"
+  | '[^'\\\n]*(?:\\.[^'\\\n]*)*'
+""", re.VERBOSE | re.ASCII)
+# a keyword selector spelled out in a string, as passed to NSSelectorFromString or performSelector
+SELECTOR_STRING_RE = re.compile(r"(?:[A-Za-z_]\w*:)+\Z", re.ASCII)
+
+# the name in the head of a method that takes no arguments, "- (void)foo;" or "- (void)foo {", so
+# its own declaration and definition aren't taken for uses of it. a head always follows an
+# @interface or @implementation line, so starting at a "\n" loses nothing and lets the engine skip
+# straight to line starts. the return type and the rest of the head have to end on the line they
+# start on (the "{" of a definition can be on the next), so a failed match never reads past the
+# following line and runs of lines starting with "-" stay linear
+UNARY_METHOD_HEAD_RE = re.compile(
+    r"\n[ \t]*[-+][ \t]*(?:\([^;{()\n]*(?:\([^;{()\n]*\)[^;{()\n]*)*\))?\s*([A-Za-z_]\w*)[^;{:\n]*(?:\n[ \t]*)?[;{]",
+    re.ASCII
+)
+
+# every kind of file that can use a symbol or import a header. prefix headers (.pch) are needed for
+# the import graph even when they use nothing, since whatever they import is visible everywhere
+REFERENCE_EXTENSIONS = {'.m', '.mm', '.h', '.hpp', '.pch', '.swift', '.c', '.cc', '.cpp'}
+
+# set in each pool worker by set_matcher so the matcher is built once per process instead of
+# being pickled with every task
+_matcher = None
+
+def set_matcher(matcher):
+    global _matcher
+    _matcher = matcher
+
+def blank_method_names(content):
+    # heads inside a {} block are expressions like "a\n  - (int)b;" and are left alone
+    pieces = []
+    position = 0
+    depth = 0
+    counted = 0
+    for head in UNARY_METHOD_HEAD_RE.finditer(content):
+        depth = max(depth + content.count("{", counted, head.start()) - content.count("}", counted, head.start()), 0)
+        counted = head.start()
+        if not depth:
+            pieces.append(content[position:head.start(1)])
+            pieces.append(" " * len(head.group(1)))
+            position = head.end(1)
+    if not pieces:
+        return content
+    pieces.append(content[position:])
+    return "".join(pieces)
+
+def selector_references(content):
+    # keyword selectors used by message sends ("[obj foo:x bar:y]" uses "foo:bar:"), @selector()
+    # and strings. selectors without arguments are plain identifiers and are found with those
+    selectors = set()
+    # the keywords and ()/{} depth of the innermost open "[", with the outer ones on the stack.
+    # keywords only count at the depth of their own send, so "(a ? b : c)" and labels in blocks
+    # aren't taken for keywords
+    sends = []
+    keywords = None
+    send_depth = -1
+    depth = 0
+    for delimiter, keyword, selector, string in SELECTOR_TOKEN_RE.findall(content):
+        if keyword:
+            if depth == send_depth:
+                keywords.append(keyword)
+        elif delimiter == "[":
+            sends.append((keywords, send_depth))
+            keywords = []
+            send_depth = depth
+        elif delimiter == "]":
+            if sends:
+                if keywords:
+                    selectors.add(":".join(keywords) + ":")
+                keywords, send_depth = sends.pop()
+        elif delimiter:
+            if delimiter in "({":
+                depth += 1
+            elif depth:
+                depth -= 1
+        elif selector:
+            if ":" in selector:
+                selectors.add(selector)
+        elif string and SELECTOR_STRING_RE.match(string):
+            selectors.add(string)
+    return selectors
+
+def parse_references(content, matcher=None, with_imports=False):
+    # with_imports also returns the headers content imports, found in the same scrubbed text
+    scrubbed = blank_method_names(utils.scrub(content))
+    if matcher is not None:
+        found = matcher.matches(scrubbed)
+        # the selector scan only runs when there are keyword selectors to look for
+        if matcher.selectors:
+            found |= matcher.selectors.intersection(selector_references(scrubbed))
+    else:
+        found = set(IDENTIFIER_RE.findall(scrubbed)) | selector_references(scrubbed)
+    if with_imports:
+        return found, imports.find_imports(scrubbed)
+    return found
+
+def get_references(source_path, with_imports=False):
+    with open(source_path, 'rb') as source:
+        content = source.read()
+    if with_imports:
+        return (source_path,) + parse_references(content, _matcher, True)
+    return source_path, parse_references(content, _matcher)
+
+def build_index(reference_info, symbols=None):
+    # inverted index from identifier to the files that mention it. when the declared symbols are
+    # known up front we only keep those, which keeps the index small on big trees
+    index = {}
+    for source_path, identifiers in reference_info:
+        if symbols is not None:
+            identifiers = identifiers & symbols
+        for identifier in identifiers:
+            index.setdefault(identifier, set()).add(source_path)
+    return index
+
+_NOWHERE = frozenset()
+
+def find_dead_symbols(symbol_info, index, aliases=None, referencing=None):
+    # aliases maps a symbol name to other names that count as using it, e.g. a property's setter.
+    # referencing(header_path, symbol) returns a test for whether a file's use counts, or None when
+    # every file's does. only the files that mention a name are tested, so the cost follows the uses
+    aliases = aliases or {}
+    for header_path, symbols in symbol_info:
+        for symbol in symbols:
+            names = (symbol,) + aliases.get(symbol, ())
+            counts = referencing(header_path, symbol) if referencing is not None else None
+            if not any(
+                path != header_path and (counts is None or counts(path))
+                for name in names for path in index.get(name, _NOWHERE)
+            ):
+                yield header_path, symbol
@@ -1,52 +1,330 @@
-from itertools import chain
-from multiprocessing import Pool
-from contextlib import closing
+from itertools import chain, islice
+from multiprocessing import Pool, cpu_count
+from contextlib import closing, nullcontext
+from functools import partial
 
 import argparse
+import cache
+import imports
+import incremental
+import interning
+import json
 import os
-from parsers import enum, define, constant, functions, interface, protocol, typedef
+import matcher
+import profiling
+import references
+import sys
+import walker
+from parsers import enum, define, constant, functions, interface, property, protocol, selector, struct, typedef, utils
 
 
 PARSERS = [
     enum,
+    struct,
     define,
     constant,
     functions,
     interface,
     protocol,
     typedef,
+    selector,
+    property,
 ]
 
-def iter_files(dirs, extensions=None):
+def iter_files(dirs, extensions=None, excludes=walker.DEFAULT_EXCLUDES, gitignore=True):
     extensions = extensions or set()
-    path_iters = chain(*[os.walk(d) for d in dirs])
-    for dirpath, _, filenames in path_iters:
-        full_path = os.path.abspath(dirpath)
-        for filename in filenames:
-            if os.path.splitext(filename)[-1] in extensions:
-                yield os.path.join(full_path, filename)
+    return walker.Walker(extensions, excludes, gitignore).walk(dirs)
+
+# chunks start at one task so every worker has something to do straight away, then grow with the
+# number of tasks handed out so far to cut the per-task pickling on big trees. the walker is a
+# generator, so the running count is the only size there is to go on
+MAX_CHUNKSIZE = 64
+
+def chunked(iterable, jobs):
+    iterator = iter(iterable)
+    dispatched = 0
+    while True:
+        chunk = list(islice(iterator, max(1, min(dispatched // (jobs * 4), MAX_CHUNKSIZE))))
+        if not chunk:
+            return
+        dispatched += len(chunk)
+        yield chunk
+
+def map_chunk(func, chunk):
+    return [func(item) for item in chunk]
+
+def map_pooled(pool, func, iterable, jobs):
+    for results in pool.imap_unordered(partial(map_chunk, func), chunked(iterable, jobs)):
+        for result in results:
+            yield result
+
+def map_unordered(func, iterable, jobs, initializer=None, initargs=(), pool=None):
+    # results are yielded as soon as they're ready. jobs=1 runs everything in this process, which
+    # skips the fork and pickling overhead on small trees and keeps tracebacks readable. pool is a
+    # running pool of jobs workers to use instead of starting one, and its owner closes it
+    if jobs == 1:
+        if initializer is not None:
+            initializer(*initargs)
+        for item in iterable:
+            yield func(item)
+        return
+    if pool is not None:
+        for result in map_pooled(pool, func, iterable, jobs):
+            yield result
+        return
+    with closing(Pool(jobs, initializer, initargs)) as pool:
+        for result in map_pooled(pool, func, iterable, jobs):
+            yield result
+
+def parse_header(header):
+    # comments are scrubbed once for the whole header, and every parser shares the result and its
+    # newline index
+    return list(chain(*(parser.parse.symbols(header) for parser in PARSERS)))
+
+def parse_content(content):
+    return parse_header(utils.Header(utils.scrub(content)))
 
 def get_symbols(header_path):
-    with open(header_path, 'r') as header:
-        content = header.read()
-    return header_path, list(chain(*(parser.parse(content) for parser in PARSERS)))
+    return header_path, parse_header(utils.read_header(header_path))
+
+def get_packed_symbols(header_path):
+    # get_symbols for pool workers, with the symbols in interning.pack's compact form for the trip
+    # back to the parent
+    return header_path, interning.pack(parse_header(utils.read_header(header_path)))
+
+def unpacked(results):
+    for header_path, packed in results:
+        yield header_path, interning.unpack(packed)
+
+def parse_pool(jobs):
+    # the pool for parsing a stream of headers, started before the stream is: the walker and
+    # cache.overlap both run threads, and forking a pool from a process with running threads can
+    # deadlock the workers. None for jobs=1, which doesn't need one
+    if jobs == 1:
+        return nullcontext()
+    return closing(Pool(jobs))
+
+def parse_buffer(item):
+    key, content = item
+    return key, parse_content(content)
+
+def analyze_buffers(buffers, jobs=1, cache_dir=None):
+    # library entry point for headers that are already in memory, e.g. from a virtual file system.
+    # buffers is an iterable of (name, bytes) pairs, consumed lazily, and (name, symbols) pairs are
+    # yielded as they're ready, in no particular order. with cache_dir symbols are cached by
+    # content, the same way search.py caches headers on disk, and the misses all go to one pool
+    if cache_dir is None:
+        for result in map_unordered(parse_buffer, buffers, jobs):
+            yield result
+        return
+    with parse_pool(jobs) as pool, closing(cache.SymbolCache(cache_dir, cache.parser_version(PARSERS))) as symbol_cache:
+        parse_many = lambda misses: map_unordered(parse_buffer, misses, jobs, pool=pool)
+        for result in symbol_cache.resolve_buffers(buffers, parse_many):
+            yield result
+
+def get_symbols_profiled(header_path, with_pstats=False):
+    # kept apart from get_symbols so that runs without --profile don't pay for any timing
+    return profiling.profile_header(header_path, PARSERS, with_pstats)
+
+def write_ndjson(stream, header_path, symbols):
+    for symbol in symbols:
+        record = symbol._asdict()
+        if not symbol.aliases:
+            del record['aliases']
+        record['path'] = header_path
+        stream.write(json.dumps(record))
+        stream.write("\n")
+    stream.flush()
+
+def profiled(results, run_profile):
+    for header_path, symbols, file_profile in results:
+        run_profile.add(file_profile)
+        yield header_path, symbols
+
+def resolve_symbols(header_paths, args, run_profile=None):
+    # with run_profile only headers that actually get parsed are profiled, cache hits aren't
+    with parse_pool(args.jobs) as pool:
+        if run_profile is None and args.jobs == 1:
+            parse_many = lambda paths: map_unordered(get_symbols, paths, args.jobs)
+        elif run_profile is None:
+            parse_many = lambda paths: unpacked(map_unordered(get_packed_symbols, paths, args.jobs, pool=pool))
+        else:
+            profile_one = partial(get_symbols_profiled, with_pstats=bool(args.profile_pstats))
+            parse_many = lambda paths: profiled(map_unordered(profile_one, paths, args.jobs, pool=pool), run_profile)
+        if args.no_cache:
+            for result in parse_many(header_paths):
+                yield result
+            return
+        with closing(cache.SymbolCache(args.cache_dir, cache.parser_version(PARSERS))) as symbol_cache:
+            for result in symbol_cache.resolve(header_paths, parse_many):
+                yield result
+
+# kinds that files can use without importing the header declaring them: classes and protocols
+# through a forward declaration ("@class Foo;", "@protocol Foo;"), and selectors and properties
+# (with their setters and ivars) by sending them to an id, a superclass or another header's protocol
+UNPRUNED_KINDS = {"interface", "protocol", "selector", "property"}
+
+# the kinds --check was written for, the ones the original parsers returned. its keyword test
+# would flag ordinary selectors, properties and struct fields such as "identifier" or "classForCoder"
+CHECKED_KINDS = {"define", "constant", "function", "typedef", "enum", "enum_constant", "interface", "protocol"}
+
+def recording_imports(reference_info, scanned):
+    # passes (path, identifiers) on to build_index and keeps (path, imported names) for the graph
+    for path, identifiers, names in reference_info:
+        scanned.append((path, names))
+        yield path, identifiers
+
+def import_pruning(scanned, unpruned):
+    # a symbol can only be used by files that import its header, directly or through other headers
+    graph = imports.ImportGraph(scanned)
+    def referencing(header_path, symbol):
+        if symbol in unpruned or graph.visible_everywhere(header_path):
+            return None
+        return lambda path: graph.sees(path, header_path)
+    return referencing
+
+def header_declarations(path, content):
+    # (name, aliases) for every symbol the header at path declares in content
+    if os.path.splitext(path)[-1] != '.h':
+        return []
+    return [(symbol.name, symbol.aliases) for symbol in parse_content(content)]
+
+def sync_index(index, root, args, excludes):
+    extensions = references.REFERENCE_EXTENSIONS
+    stale = index.stale_paths(root)
+    if stale is None:
+        paths = list(iter_files(args.dirs, extensions, excludes, not args.no_gitignore))
+    else:
+        paths = [path for path in stale if incremental.in_scope(path, args.dirs, extensions, excludes)]
+    existing = [path for path in paths if os.path.exists(path)]
+    for path in set(paths) - set(existing):
+        index.remove(path)
+
+    headers = [path for path in existing if os.path.splitext(path)[-1] == '.h']
+    declarations = {}
+    for header_path, symbols in map_unordered(get_symbols, headers, args.jobs):
+        declarations[header_path] = [(symbol.name, symbol.aliases) for symbol in symbols]
+    # the index keeps every identifier, not just declared ones, because a later change can declare
+    # a symbol that unchanged files already use
+    reference_info = map_unordered(references.get_references, existing, args.jobs, references.set_matcher, (None,))
+    for path, identifiers in reference_info:
+        index.update(path, declarations.get(path, ()), identifiers)
+    index.mark_synced(root)
+
+def report_since(args, excludes):
+    args.dirs = [os.path.realpath(directory) for directory in args.dirs]
+    root = incremental.git_root(args.dirs[0])
+    with closing(incremental.ReferenceIndex(args.cache_dir, cache.parser_version(PARSERS))) as index:
+        sync_index(index, root, args, excludes)
+        changed = {
+            path for path in incremental.changed_paths(root, args.since)
+            if incremental.in_scope(path, args.dirs, references.REFERENCE_EXTENSIONS, excludes)
+        }
+        newly_dead, revived = incremental.changed_dead_symbols(
+            index, root, args.since, changed, header_declarations, references.parse_references
+        )
+    for symbol, filename in sorted(newly_dead):
+        print("Unused: %s in %s" % (symbol, filename))
+    for symbol, filename in sorted(revived):
+        print("Used again: %s in %s" % (symbol, filename))
+    return os.EX_OK
+
+def job_count(value):
+    jobs = int(value)
+    if jobs < 1:
+        raise argparse.ArgumentTypeError("must be at least 1, got %d" % jobs)
+    return jobs
 
 def main():
     parser = argparse.ArgumentParser(description='Tool to find unused code')
     parser.add_argument('dirs', nargs='+')
     parser.add_argument('--check', action="store_true")
+    parser.add_argument('--dead', action="store_true", help="report symbols never referenced outside their header")
+    parser.add_argument('--match', choices=sorted(matcher.MATCHERS), default='identifier',
+                        help="how --dead looks for symbols in source files")
+    parser.add_argument('--cache-dir', default=cache.CACHE_DIR, help="where parsed header symbols are cached between runs")
+    parser.add_argument('--no-cache', action="store_true")
+    parser.add_argument('--jobs', '-j', type=job_count, default=cpu_count(), help="worker processes, 1 to run in-process")
+    parser.add_argument('--exclude', action='append', default=[], metavar='GLOB',
+                        help="skip files and directories matching GLOB, in addition to %s" % ", ".join(walker.DEFAULT_EXCLUDES))
+    parser.add_argument('--no-gitignore', action="store_true", help="don't skip paths ignored by .gitignore files")
+    parser.add_argument('--since', metavar='REV',
+                        help="only report symbols that became unused, or used again, since git revision REV. "
+                             "uses count from every file, as with --no-prune")
+    parser.add_argument('--no-prune', action="store_true",
+                        help="have --dead count uses from every file, not just the files that import the symbol's header")
+    parser.add_argument('--format', choices=['ndjson'], help="stream every symbol to stdout as each header finishes. can't be combined with --check, --dead "
+                             "or --since")
+    parser.add_argument('--profile', action="store_true",
+                        help="time every parser on every parsed header and print a breakdown to stderr. cached headers "
+                             "aren't parsed, so combine with --no-cache to profile the whole tree")
+    parser.add_argument('--profile-top', type=int, default=10, metavar='N', help="how many of the slowest headers --profile lists")
+    parser.add_argument('--profile-json', metavar='PATH', help="write the --profile numbers for every header to PATH")
+    parser.add_argument('--profile-pstats', metavar='PATH', help="run cProfile over header parsing and dump the merged pstats to PATH")
     args = parser.parse_args()
+    if args.format == 'ndjson':
+        # the reports below are plain lines, which would break a stream of json records
+        for option in ('check', 'dead', 'since'):
+            if getattr(args, option):
+                parser.error("--format ndjson can't be combined with --%s" % option)
+
+    # only hold on to every header's symbols when a later phase needs them, so plain streaming
+    # stays at constant memory regardless of the size of the tree
+    keep_symbols = args.check or args.dead
+    symbol_table = interning.SymbolTable()
+    excludes = walker.DEFAULT_EXCLUDES + tuple(args.exclude)
+    if args.since:
+        return report_since(args, excludes)
 
-    with closing(Pool(4)) as p:
-        symbol_info = list((p.map(get_symbols, iter_files(args.dirs, {'.h'}))))
+    run_profile = None
+    if args.profile or args.profile_json or args.profile_pstats:
+        run_profile = profiling.RunProfile()
+    header_paths = iter_files(args.dirs, {'.h'}, excludes, not args.no_gitignore)
+    try:
+        for header_path, symbols in resolve_symbols(header_paths, args, run_profile):
+            if args.format == 'ndjson':
+                write_ndjson(sys.stdout, header_path, symbols)
+            if keep_symbols:
+                symbol_table.add(header_path, symbols)
+    except BrokenPipeError:
+        # the reader stopped early, e.g. "--format ndjson | head". stdout goes to devnull so the
+        # flush at exit doesn't fail on the closed pipe too
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return os.EX_OK
+    symbol_table.freeze()
+
+    if run_profile is not None:
+        run_profile.report(sys.stderr, args.profile_top)
+        if args.profile_json:
+            run_profile.write_json(args.profile_json)
+        if args.profile_pstats:
+            run_profile.dump_stats(args.profile_pstats)
+
+    if args.dead:
+        # other names that count as a use of a symbol, e.g. a property's setter and instance variable
+        aliases = symbol_table.alias_names()
+        symbol_matcher = matcher.MATCHERS[args.match](symbol_table.declared())
+        source_paths = iter_files(args.dirs, references.REFERENCE_EXTENSIONS, excludes, not args.no_gitignore)
+        # the import graph comes out of the same pass over the sources as the references
+        scanned = []
+        reference_info = map_unordered(partial(references.get_references, with_imports=not args.no_prune), source_paths,
+                                       args.jobs, references.set_matcher, (symbol_matcher,))
+        if not args.no_prune:
+            reference_info = recording_imports(reference_info, scanned)
+        index = references.build_index(reference_info)
+        referencing = None if args.no_prune else import_pruning(scanned, symbol_table.names_of_kind(UNPRUNED_KINDS))
 
     if args.check:
-        for filename, symbols in symbol_info:
+        for filename, symbols in symbol_table.by_file(CHECKED_KINDS):
             for symbol in symbols:
                 if len(symbol) == 0 or len(symbol) == 1:
-                    print "Problem: %s in %s" % (symbol, filename)
+                    print("Problem: %s in %s" % (symbol, filename))
                 if any(kw in symbol for kw in {"@", "void", "while", "if", "switch", "property", "interface", "protocol", "class", "implementation", "typedef", "#", "define"}):
-                    print "Problem: %s in %s" % (symbol, filename)
+                    print("Problem: %s in %s" % (symbol, filename))
+
+    if args.dead:
+        for filename, symbol in references.find_dead_symbols(symbol_table.by_file(), index, aliases, referencing):
+            print("Unused: %s in %s" % (symbol, filename))
     return os.EX_OK
 
 if __name__ == '__main__':
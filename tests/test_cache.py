@@ -0,0 +1,98 @@
+import os
+import shutil
+import tempfile
+import threading
+from unittest import TestCase
+
+from cache import SymbolCache
+from parsers.utils import Symbol
+
+SYMBOLS = [Symbol("kFoo", "define", 1, 9, 8), Symbol("userName", "property", 2, 40, 55, ("setUserName:", "_userName"))]
+
+class SymbolCacheTest(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.directory, 'cache')
+        self.header = os.path.join(self.directory, 'Foo.h')
+        self._write("#define kFoo 1\n")
+        self.parsed = []
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _write(self, content):
+        with open(self.header, 'w') as header:
+            header.write(content)
+
+    def _parse_many(self, paths):
+        paths = list(paths)
+        self.parsed.extend(paths)
+        return [(path, SYMBOLS) for path in paths]
+
+    def _resolve(self, version='1', paths=None):
+        symbol_cache = SymbolCache(self.cache_dir, version)
+        try:
+            return list(symbol_cache.resolve(paths or [self.header], self._parse_many))
+        finally:
+            symbol_cache.close()
+
+    def test_unchanged_header_is_not_parsed_again(self):
+        self.assertEqual([(self.header, SYMBOLS)], self._resolve())
+        self.assertEqual([(self.header, SYMBOLS)], self._resolve())
+        self.assertEqual([self.header], self.parsed)
+
+    def test_touched_header_with_same_content_is_not_parsed_again(self):
+        self._resolve()
+        stat = os.stat(self.header)
+        os.utime(self.header, (stat.st_atime, stat.st_mtime + 10))
+        self._resolve()
+        self.assertEqual([self.header], self.parsed)
+
+    def test_changed_header_is_parsed_again(self):
+        self._resolve()
+        self._write("#define kFoo 2\n#define kBar 3\n")
+        self._resolve()
+        self.assertEqual([self.header, self.header], self.parsed)
+
+    def test_parser_version_change_invalidates(self):
+        self._resolve(version='1')
+        self._resolve(version='2')
+        self.assertEqual([self.header, self.header], self.parsed)
+
+    def test_deleted_headers_are_evicted(self):
+        self._resolve()
+        os.remove(self.header)
+        symbol_cache = SymbolCache(self.cache_dir, '1')
+        try:
+            self.assertEqual([], list(symbol_cache.resolve([], self._parse_many)))
+            rows = symbol_cache.connection.execute("SELECT path FROM symbols").fetchall()
+        finally:
+            symbol_cache.close()
+        self.assertEqual([], rows)
+
+    def test_header_deleted_after_the_walk_is_skipped(self):
+        missing = os.path.join(self.directory, 'Gone.h')
+        self.assertEqual([(self.header, SYMBOLS)], self._resolve(paths=[missing, self.header]))
+        self.assertEqual([self.header], self.parsed)
+
+    def test_misses_are_parsed_while_paths_are_consumed(self):
+        parsing = threading.Event()
+        waited = []
+        def paths():
+            yield self.header
+            waited.append(parsing.wait(5))
+        def parse_many(misses):
+            for path in misses:
+                parsing.set()
+                yield path, SYMBOLS
+        symbol_cache = SymbolCache(self.cache_dir, '1')
+        try:
+            self.assertEqual([(self.header, SYMBOLS)], list(symbol_cache.resolve(paths(), parse_many)))
+        finally:
+            symbol_cache.close()
+        self.assertEqual([True], waited)
+
+    def test_header_walked_twice(self):
+        # "search.py src src/Sub" finds headers in src/Sub twice
+        self.assertEqual([(self.header, SYMBOLS)] * 2, self._resolve(paths=[self.header, self.header]))
+        self.assertEqual([(self.header, SYMBOLS)] * 2, self._resolve(paths=[self.header, self.header]))
@@ -4,7 +4,7 @@ from parsers.constant import parse
 
 class ConstantSymbolParserTest(TestCase):
     def _assertParse(self, expected, content):
-        self.assertItemsEqual(
+        self.assertCountEqual(
             expected,
             parse(content)
         )
@@ -225,7 +225,7 @@ class ConstantSymbolParserTest(TestCase):
           unsigned int abbreviateUnits : 1; // If YES use unit abbreviations (i.e. miles -> mi)
         } YPLocalizationDistanceOptions;
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             [],
             parse(content)
         )
@@ -234,8 +234,34 @@ class ConstantSymbolParserTest(TestCase):
         content = """
         static const CGFloat kFooterButtonHeight = 44.0;
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             ["kFooterButtonHeight"],
             parse(content)
         )
 
+    def test_after_interface(self):
+        content = """
+        @protocol YPUserBadgeViewDelegate, YPOtherDelegate;
+
+        @interface YPUserBadgeView : UIView {
+          NSString *_userName;
+        }
+        @property (copy, nonatomic) NSString *userName;
+        @end
+
+        extern NSString *const YPUserBadgeViewDidTapNotification;
+
+        @protocol YPUserBadgeViewDelegate <NSObject>
+        - (void)badgeViewDidTap:(YPUserBadgeView *)view;
+        @end
+
+        extern NSString *const YPUserBadgeViewDidLongPressNotification;
+        """
+        self._assertParse([
+            "YPUserBadgeViewDidTapNotification",
+            "YPUserBadgeViewDidLongPressNotification",
+        ], content)
+
+    def test_right_after_end(self):
+        content = "@interface A : NSObject\n@end\nextern NSString *const YPSecond;\n"
+        self._assertParse(["YPSecond"], content)
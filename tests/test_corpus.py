@@ -0,0 +1,40 @@
+from unittest import TestCase
+
+import os
+import random
+import shutil
+import tempfile
+
+import search
+from benchmarks import corpus, suite
+from parsers import utils
+
+class CorpusTest(TestCase):
+    def test_deterministic(self):
+        self.assertEqual(
+            corpus.generate_header(random.Random(3), "YPFoo", 4096),
+            corpus.generate_header(random.Random(3), "YPFoo", 4096)
+        )
+
+    def test_size(self):
+        content, _ = corpus.generate_header(random.Random(0), "YPFoo", 10000)
+        self.assertGreaterEqual(len(content), 10000)
+        self.assertLess(len(content), 12000)
+
+    def test_declared_names_are_found(self):
+        # the generator only writes declarations the parsers understand, so timings measure real work
+        content, names = corpus.generate_header(random.Random(0), "YPFoo", 20000)
+        header = utils.Header(utils.scrub_comments(content))
+        found = {symbol.name for _, module in suite.parser_modules() for symbol in module.parse.symbols(header)}
+        self.assertEqual(set(names), found & set(names))
+
+    def test_write_corpus(self):
+        directory = tempfile.mkdtemp()
+        try:
+            total = corpus.write_corpus(directory, 150, 1024)
+            headers = list(search.iter_files([directory], {'.h'}))
+            self.assertEqual(150, len(headers))
+            self.assertEqual(150, len(list(search.iter_files([directory], {'.m'}))))
+            self.assertEqual(total, sum(os.path.getsize(path) for path in headers))
+        finally:
+            shutil.rmtree(directory)
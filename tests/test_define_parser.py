@@ -3,7 +3,7 @@ from parsers.define import parse
 
 class DefineSymbolParserTest(TestCase):
     def _assertParse(self, expected, content):
-        self.assertItemsEqual(
+        self.assertCountEqual(
             expected,
             parse(content)
         )
@@ -74,7 +74,7 @@ class DefineSymbolParserTest(TestCase):
 
         @end
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             [],
             parse(content)
         )
@@ -86,3 +86,13 @@ class DefineSymbolParserTest(TestCase):
           } while (0)
         """
         self._assertParse(["YPDebug"], content)
+
+    def test_ignores_if_zero(self):
+        content = """
+        #if 0
+        #define YPOldDebug 1
+        #else
+        #define YPDebugEnabled 1
+        #endif
+        """
+        self._assertParse(["YPDebugEnabled"], content)
@@ -10,7 +10,7 @@ class EnumSymbolParserTest(TestCase):
             kActivityViewSection = 2
         };
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             ["MyCheckInsViewControllerSection", "kStatusCellSection", "kCheckInsSection", "kActivityViewSection"],
             parse(content)
         )
@@ -30,7 +30,7 @@ class EnumSymbolParserTest(TestCase):
 
 
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             ["MyCheckInsViewControllerSection", "kStatusCellSection", "kCheckInsSection", "kActivityViewSection"],
             parse(content)
         )
@@ -43,7 +43,7 @@ class EnumSymbolParserTest(TestCase):
           YPWeeklyYelpRequestSourceMoreMenu,
         };
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             ["YPWeeklyYelpRequestSource", "YPWeeklyYelpRequestSourceUnknown", "YPWeeklyYelpRequestSourceDiscover", "YPWeeklyYelpRequestSourceMoreMenu"],
             parse(content)
         )
@@ -62,7 +62,7 @@ class EnumSymbolParserTest(TestCase):
           YPWeeklyYelpRequestSourceMoreMenu, // request weekly from the weekly button in the more menu
         };
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             ["YPWeeklyYelpRequestSource", "YPWeeklyYelpRequestSourceUnknown", "YPWeeklyYelpRequestSourceDiscover", "YPWeeklyYelpRequestSourceMoreMenu"],
             parse(content)
         )
@@ -73,7 +73,7 @@ class EnumSymbolParserTest(TestCase):
             AccountPaymentMethodsSectionAllMethods = 0,
             AccountPaymentMethodsSectionAddNewCard};
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             ["AccountPaymentMethodsSection", "AccountPaymentMethodsSectionAllMethods", "AccountPaymentMethodsSectionAddNewCard"],
             parse(content)
         )
@@ -83,7 +83,7 @@ class EnumSymbolParserTest(TestCase):
         NS_ENUM(NSInteger, AccountPaymentMethodsSection){ AccountPaymentMethodsSectionAllMethods = 0,
             AccountPaymentMethodsSectionAddNewCard};
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             ["AccountPaymentMethodsSection", "AccountPaymentMethodsSectionAllMethods", "AccountPaymentMethodsSectionAddNewCard"],
             parse(content)
         )
@@ -92,7 +92,7 @@ class EnumSymbolParserTest(TestCase):
         content = """
         NS_ENUM(NSInteger, AccountPaymentMethodsSection){ AccountPaymentMethodsSectionAllMethods = 0, AccountPaymentMethodsSectionAddNewCard};
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             ["AccountPaymentMethodsSection", "AccountPaymentMethodsSectionAllMethods", "AccountPaymentMethodsSectionAddNewCard"],
             parse(content)
         )
@@ -101,7 +101,7 @@ class EnumSymbolParserTest(TestCase):
         content = """
         typedef NS_ENUM(NSInteger, YPSearchFilterTableViewGroupIdentifier);
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             [],
             parse(content)
         )
@@ -117,7 +117,7 @@ class EnumSymbolParserTest(TestCase):
         NS_ENUM(NSInteger, AccountPaymentMethodsSection){ AccountPaymentMethodsSectionAllMethods = 0,
             AccountPaymentMethodsSectionAddNewCard};
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             [
                 "YPWeeklyYelpRequestSource",
                 "YPWeeklyYelpRequestSourceUnknown",
@@ -142,7 +142,7 @@ class EnumSymbolParserTest(TestCase):
           CompressionModeRaw,
         } CompressionMode;
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             [
                 "YPKey",
                 "YPKeyKahuna",
@@ -166,7 +166,7 @@ class EnumSymbolParserTest(TestCase):
         };
         typedef NSInteger YPReviewActivity;
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             [
                 "YPReviewActivityNone",
                 "YPReviewActivityNotStarted",
@@ -185,7 +185,7 @@ class EnumSymbolParserTest(TestCase):
             kActivityViewSection = 1 << 3
         };
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             ["MyCheckInsViewControllerSection", "kStatusCellSection", "kCheckInsSection", "kActivityViewSection"],
             parse(content)
         )
@@ -203,7 +203,7 @@ class EnumSymbolParserTest(TestCase):
           unsigned int abbreviateUnits : 1; // If YES use unit abbreviations (i.e. miles -> mi)
         } YPLocalizationDistanceOptions;
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             [],
             parse(content)
         )
@@ -224,7 +224,7 @@ class EnumSymbolParserTest(TestCase):
         #endif
         };
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             [
             "YPMoreMenuSecondarySectionRow",
             "YPMoreMenuSecondarySectionMonocleRow",
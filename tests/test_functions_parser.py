@@ -4,7 +4,7 @@ from parsers.functions import parse
 
 class FunctionSymbolParserTest(TestCase):
     def _assertParse(self, expected, content):
-        self.assertItemsEqual(
+        self.assertCountEqual(
             expected,
             parse(content)
         )
@@ -13,7 +13,7 @@ class FunctionSymbolParserTest(TestCase):
         content = """
         NSString *YPNSStringFromYPGender(YPGender gender);
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             ["YPNSStringFromYPGender"],
             parse(content)
         )
@@ -22,7 +22,7 @@ class FunctionSymbolParserTest(TestCase):
         content = """
         NSArray<NSString *> YPGenderNames();
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             ["YPGenderNames"],
             parse(content)
         )
@@ -31,7 +31,7 @@ class FunctionSymbolParserTest(TestCase):
         content = """
         static inline void Fix();
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             ["Fix"],
             parse(content)
         )
@@ -60,7 +60,7 @@ class FunctionSymbolParserTest(TestCase):
 
         @end
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             [],
             parse(content)
         )
@@ -79,7 +79,7 @@ class FunctionSymbolParserTest(TestCase):
 
         @end
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             [],
             parse(content)
         )
@@ -120,7 +120,61 @@ class FunctionSymbolParserTest(TestCase):
         - (void)sendAnalyticForAuthorizationStatus;
         @end
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             [],
             parse(content)
         )
+
+    def test_ignores_method_attributes(self):
+        content = """
+        @interface YPView : UIView
+        - (void)loadWithCompletion:(void (^)(BOOL finished))completion API_AVAILABLE(ios(10.0));
+        - (void)reload __attribute__((deprecated));
+        @end
+
+        NSString *YPNameFromView(YPView *view);
+        """
+        self._assertParse(["YPNameFromView"], content)
+
+    def test_declarations_around_macros(self):
+        content = """
+        NS_ASSUME_NONNULL_BEGIN
+        YP_SINGLETON(YPThing)
+        FOUNDATION_EXPORT NSString *YPExported(void) NS_SWIFT_NAME(exported());
+        void YPDeprecated(void) __attribute__((deprecated));
+        extern NSString *const kYPName NS_SWIFT_NAME(name);
+        NS_ASSUME_NONNULL_END
+        """
+        self._assertParse(["YPExported", "YPDeprecated"], content)
+
+    def test_inline_definitions(self):
+        content = """
+        static inline CGFloat YPClamp(CGFloat value) {
+          if (value < 0) {
+            return 0;
+          }
+          return MIN(value, 1);
+        }
+        struct YPPoint YPMakePoint(int x, int y);
+        """
+        self._assertParse(["YPClamp", "YPMakePoint"], content)
+
+    def test_ignores_variables(self):
+        content = """
+        extern void (^YPHandler)(void);
+        extern int (*YPPointer)(int);
+        static const CGFloat kYPHeight = MAX(1, 2);
+        """
+        self._assertParse([], content)
+
+    def test_extern_c(self):
+        content = """
+        #ifdef __cplusplus
+        extern "C" {
+        #endif
+        void YPInsideExternC(int value);
+        #ifdef __cplusplus
+        }
+        #endif
+        """
+        self._assertParse(["YPInsideExternC"], content)
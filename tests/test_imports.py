@@ -0,0 +1,92 @@
+import os
+from unittest import TestCase
+
+from imports import ImportGraph, imported_names
+
+class ImportedNamesTest(TestCase):
+    def test_import_forms(self):
+        content = """
+        #import "YPFoo.h"
+        #include <Kit/YPBar.h>
+        # import "Nested/YPBaz.h"
+        @import Kit.YPQux;
+        @import Kit;
+        // #import "YPCommented.h"
+        #if 0
+        #import "YPDead.h"
+        #endif
+        """
+        self.assertEqual(
+            ["YPFoo.h", "Kit/YPBar.h", "Nested/YPBaz.h", "Kit/YPQux.h", "Kit/Kit.h"],
+            imported_names(content)
+        )
+
+class ImportGraphTest(TestCase):
+    def _path(self, *parts):
+        return os.path.join("app", *parts)
+
+    def test_transitive_importers(self):
+        model, view, controller, other = (
+            self._path("Model", "YPModel.h"), self._path("View", "YPView.h"),
+            self._path("YPController.m"), self._path("YPOther.m"),
+        )
+        graph = ImportGraph([
+            (model, ["Foundation/Foundation.h"]),
+            (view, ["Model/YPModel.h"]),
+            (controller, ["View/YPView.h", "YPController.h"]),
+            (other, []),
+        ])
+        self.assertEqual({view}, graph.imports[controller])
+        self.assertEqual({model, view, controller}, graph.transitive_importers(model))
+        self.assertEqual({other}, graph.transitive_importers(other))
+
+    def test_ambiguous_names(self):
+        local, first, second = self._path("A", "YPCell.h"), self._path("B", "YPCell.h"), self._path("C", "YPCell.h")
+        source, elsewhere = self._path("A", "YPList.m"), self._path("YPGrid.m")
+        graph = ImportGraph([(local, []), (first, []), (second, []), (source, ["YPCell.h"]), (elsewhere, ["YPCell.h"])])
+        # the header next to the importing file wins, otherwise every candidate is linked
+        self.assertEqual({local}, graph.imports[source])
+        self.assertEqual({local, first, second}, graph.imports[elsewhere])
+
+    def test_referencing_files(self):
+        model, view, prefix, swift, other = (
+            self._path("YPModel.h"), self._path("YPView.h"), self._path("App.pch"),
+            self._path("App.swift"), self._path("YPOther.m"),
+        )
+        graph = ImportGraph([(model, []), (view, []), (prefix, ["YPView.h"]), (swift, []), (other, [])])
+        self.assertFalse(graph.visible_everywhere(model))
+        self.assertEqual({model, swift}, {path for path in graph.imports if graph.sees(path, model)})
+        # everything sees what the prefix header imports
+        self.assertTrue(graph.visible_everywhere(view))
+
+    def test_sees_through_cycles(self):
+        first, second, third, source, other = (
+            self._path("YPFirst.h"), self._path("YPSecond.h"), self._path("YPThird.h"),
+            self._path("YPSource.m"), self._path("YPOther.m"),
+        )
+        # YPFirst.h and YPSecond.h import each other, and YPThird.h sits below both
+        graph = ImportGraph([
+            (first, ["YPSecond.h"]), (second, ["YPFirst.h", "YPThird.h"]), (third, []),
+            (source, ["YPFirst.h"]), (other, ["YPThird.h"]),
+        ])
+        for header in (first, second, third):
+            self.assertTrue(graph.sees(source, header))
+        self.assertTrue(graph.sees(second, first))
+        self.assertFalse(graph.sees(third, first))
+        self.assertFalse(graph.sees(other, second))
+        self.assertEqual({first, second, source}, graph.transitive_importers(first))
+
+    def test_framework_imports(self):
+        kit = self._path("Kit", "Classes", "KitThing.h")
+        by_path, by_module, sdk_only = self._path("App", "App.m"), self._path("App", "B.m"), self._path("App", "C.m")
+        graph = ImportGraph([
+            (kit, []),
+            (by_path, ["Kit/KitThing.h"]),
+            (by_module, ["Kit/Kit.h"]),
+            (sdk_only, ["UIKit/UIKit.h", "Foundation/Foundation.h"]),
+        ])
+        # no header ends with Kit/KitThing.h, so it's matched by file name
+        self.assertEqual({kit}, graph.imports[by_path])
+        # there's no Kit/Kit.h in the tree, but there is a Kit directory, so B.m could see anything
+        self.assertEqual({by_module}, graph.opaque)
+        self.assertEqual({kit, by_path, by_module}, {path for path in graph.imports if graph.sees(path, kit)})
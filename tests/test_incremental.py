@@ -0,0 +1,104 @@
+import os
+import shutil
+import subprocess
+import tempfile
+from argparse import Namespace
+from unittest import TestCase
+
+import incremental
+import references
+import search
+
+class IncrementalTest(TestCase):
+    def setUp(self):
+        self.root = os.path.realpath(tempfile.mkdtemp())
+        self.cache_dir = os.path.join(self.root, '.objc-dead-code-cache')
+        self._git('init', '-q')
+        self._git('config', 'user.email', 'test@example.com')
+        self._git('config', 'user.name', 'test')
+        self._write('.gitignore', '.objc-dead-code-cache/\n')
+        self._write('Foo.h', '#define kFooA 1\n#define kFooB 2\n')
+        self._write('Foo.m', '#import "Foo.h"\nint a = kFooA;\n')
+        self._write('Bar.m', 'int b = 0;\n')
+        self._git('add', '-A')
+        self._git('commit', '-q', '-m', 'base')
+        self.base = incremental.head_revision(self.root)
+        self.args = Namespace(dirs=[self.root], jobs=1, no_gitignore=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def _git(self, *arguments):
+        with open(os.devnull, 'w') as devnull:
+            subprocess.check_call(('git', '-C', self.root) + arguments, stdout=devnull)
+
+    def _write(self, name, content):
+        with open(os.path.join(self.root, name), 'w') as f:
+            f.write(content)
+
+    def _path(self, name):
+        return os.path.join(self.root, name)
+
+    def _changes(self, revision):
+        index = incremental.ReferenceIndex(self.cache_dir, 'test')
+        try:
+            search.sync_index(index, self.root, self.args, ())
+            changed = {
+                path for path in incremental.changed_paths(self.root, revision)
+                if incremental.in_scope(path, [self.root], references.REFERENCE_EXTENSIONS, ())
+            }
+            return incremental.changed_dead_symbols(
+                index, self.root, revision, changed, search.header_declarations, references.parse_references
+            )
+        finally:
+            index.close()
+
+    def test_no_changes(self):
+        self.assertEqual((set(), set()), self._changes(self.base))
+
+    def test_reference_moves(self):
+        self._write('Foo.m', '#import "Foo.h"\nint a = kFooB;\n')
+        self.assertEqual(
+            ({("kFooA", self._path('Foo.h'))}, {("kFooB", self._path('Foo.h'))}),
+            self._changes(self.base)
+        )
+
+    def test_new_unused_declaration_and_new_file(self):
+        self._write('Foo.h', '#define kFooA 1\n#define kFooB 2\n#define kFooC 3\n')
+        self._write('Baz.m', 'int c = kFooB;\n')
+        self.assertEqual(
+            ({("kFooC", self._path('Foo.h'))}, {("kFooB", self._path('Foo.h'))}),
+            self._changes(self.base)
+        )
+
+    def test_index_follows_commits(self):
+        self.assertEqual((set(), set()), self._changes(self.base))
+        self._write('Bar.m', 'int b = kFooB;\n')
+        self._git('commit', '-q', '-am', 'use kFooB')
+        head = incremental.head_revision(self.root)
+        self._write('Foo.m', 'int a = 0;\n')
+        self.assertEqual(({("kFooA", self._path('Foo.h'))}, set()), self._changes(head))
+        self.assertEqual(
+            ({("kFooA", self._path('Foo.h'))}, {("kFooB", self._path('Foo.h'))}),
+            self._changes(self.base)
+        )
+
+    def test_reverted_dirty_file_is_reindexed(self):
+        self._write('Foo.m', 'int a = kFooB;\n')
+        self._changes(self.base)
+        self._git('checkout', '--', 'Foo.m')
+        self.assertEqual((set(), set()), self._changes(self.base))
+
+    def test_property_used_through_its_setter(self):
+        self._write('User.h', '@interface YPUser : NSObject\n@property NSString *userName;\n@end\n')
+        self._write('Use.m', '#import "User.h"\nvoid use(YPUser *u) {\n  [u setUserName:@"x"];\n}\n')
+        self._git('add', '-A')
+        self._git('commit', '-q', '-m', 'set userName')
+        with_setter = incremental.head_revision(self.root)
+        self._write('Use.m', '#import "User.h"\nvoid use(YPUser *u) {\n}\n')
+        self._git('commit', '-q', '-am', 'stop setting userName')
+        without_setter = incremental.head_revision(self.root)
+        self.assertEqual(({("userName", self._path('User.h'))}, set()), self._changes(with_setter))
+        self._write('Use.m', '#import "User.h"\nvoid use(YPUser *u) {\n  u->_userName = nil;\n}\n')
+        self.assertEqual((set(), {("userName", self._path('User.h'))}), self._changes(without_setter))
+        self.assertEqual((set(), set()), self._changes(with_setter))
@@ -15,7 +15,7 @@ class InterfaceSymbolParserTest(TestCase):
 
         @end
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             ["YPWeeklyYelpView"],
             parse(content)
         )
@@ -43,7 +43,7 @@ class InterfaceSymbolParserTest(TestCase):
 
         @end
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             ["YPWeeklyYelpView"],
             parse(content)
         )
@@ -53,7 +53,7 @@ class InterfaceSymbolParserTest(TestCase):
         @interface YPWeeklyYelpView : UIView
         @end
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             ["YPWeeklyYelpView"],
             parse(content)
         )
@@ -68,7 +68,7 @@ class InterfaceSymbolParserTest(TestCase):
 
         @end
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             ["UserReviewsViewController"],
             parse(content)
         )
@@ -89,7 +89,7 @@ class InterfaceSymbolParserTest(TestCase):
 
         @end
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             ["UserReviewsViewController", "UserReviewCellDataSource"],
             parse(content)
         )
@@ -103,7 +103,7 @@ class InterfaceSymbolParserTest(TestCase):
         - (instancetype)initWithUser:(User *)user;
         @end
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             ["UserReviewsViewController"],
             parse(content)
         )
@@ -132,7 +132,7 @@ class InterfaceSymbolParserTest(TestCase):
 
         @end
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             ["ApproveFriendRequestViewController"],
             parse(content)
         )
@@ -153,7 +153,7 @@ class InterfaceSymbolParserTest(TestCase):
 
         @end
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             [],
             parse(content)
         )
@@ -182,7 +182,7 @@ class InterfaceSymbolParserTest(TestCase):
 
         @end
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             [],
             parse(content)
         )
@@ -199,7 +199,7 @@ class InterfaceSymbolParserTest(TestCase):
         - (void)sendAnalyticForAuthorizationStatus;
         @end
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             ["AnalyticsManager"],
             parse(content)
         )
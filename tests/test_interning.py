@@ -0,0 +1,49 @@
+from unittest import TestCase
+
+from interning import SymbolTable, pack, unpack
+from parsers.utils import Symbol
+
+SYMBOLS = [
+    Symbol("kFoo", "define", 1, 9, 8),
+    Symbol("userName", "property", 2, 40, 55, ("setUserName:", "_userName")),
+    Symbol("FooView", "interface", 3, 12, 90),
+]
+
+class PackTest(TestCase):
+    def test_round_trip(self):
+        self.assertEqual(SYMBOLS, unpack(pack(SYMBOLS)))
+        self.assertEqual([], unpack(pack([])))
+
+    def test_large_offsets(self):
+        symbols = [Symbol("kFar", "define", 70000, 9, 5000000), Symbol("kFar", "define", 1, 9, 8)]
+        self.assertEqual(symbols, unpack(pack(symbols)))
+
+    def test_strings_are_sent_once(self):
+        strings, _, _ = pack([Symbol("kFoo", "define", 1, 9, 8), Symbol("kFoo", "define", 2, 9, 20)])
+        self.assertEqual(["kFoo", "define"], strings.split("\0"))
+
+class SymbolTableTest(TestCase):
+    def setUp(self):
+        self.table = SymbolTable()
+        self.table.add("Foo.h", SYMBOLS)
+        self.table.add("Empty.h", [])
+        self.table.add("Bar.h", [Symbol("userName", "property", 1, 40, 39, ("setUserName:", "_userName"))])
+        self.table.freeze()
+
+    def test_by_file(self):
+        self.assertEqual(
+            [("Foo.h", ["kFoo", "userName", "FooView"]), ("Bar.h", ["userName"])],
+            list(self.table.by_file())
+        )
+        self.assertEqual([("Foo.h", ["kFoo", "FooView"])], list(self.table.by_file({"define", "interface"})))
+
+    def test_names_are_interned(self):
+        self.assertEqual(4, len(self.table))
+        self.assertEqual(["kFoo", "userName", "setUserName:", "_userName", "FooView"], self.table.strings)
+
+    def test_declared_and_aliases(self):
+        self.assertEqual({"kFoo", "userName", "setUserName:", "_userName", "FooView"}, self.table.declared())
+        self.assertEqual({"userName": ("_userName", "setUserName:")}, self.table.alias_names())
+
+    def test_names_of_kind(self):
+        self.assertEqual({"FooView", "kFoo"}, self.table.names_of_kind({"interface", "define", "protocol"}))
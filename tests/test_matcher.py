@@ -0,0 +1,30 @@
+from unittest import TestCase
+
+from matcher import IdentifierMatcher, AhoCorasickMatcher
+
+CONTENT = """
+[self loadWithType:YPWatchErrorTypeGeneric completion:nil];
+YPWatchErrorTypeGenericOther = 2;
+SEL selector = @selector(foo:bar:);
+"""
+
+class IdentifierMatcherTest(TestCase):
+    def test_whole_identifiers_only(self):
+        matcher = IdentifierMatcher(["YPWatchErrorTypeGeneric", "YPWatchErrorType", "Missing"])
+        self.assertEqual({"YPWatchErrorTypeGeneric"}, matcher.matches(CONTENT))
+
+class AhoCorasickMatcherTest(TestCase):
+    def test_substrings(self):
+        matcher = AhoCorasickMatcher(["YPWatchErrorTypeGeneric", "YPWatchErrorType", "Missing"])
+        self.assertEqual({"YPWatchErrorTypeGeneric", "YPWatchErrorType"}, matcher.matches(CONTENT))
+
+    def test_selector_fragments(self):
+        matcher = AhoCorasickMatcher(["foo:bar:", "loadWithType:", "completion:", "bar:baz:"])
+        self.assertEqual({"foo:bar:", "loadWithType:", "completion:"}, matcher.matches(CONTENT))
+
+    def test_overlapping_symbols(self):
+        matcher = AhoCorasickMatcher(["he", "she", "his", "hers"])
+        self.assertEqual({"he", "she", "hers"}, matcher.matches("ushers"))
+
+    def test_no_symbols(self):
+        self.assertEqual(set(), AhoCorasickMatcher([]).matches(CONTENT))
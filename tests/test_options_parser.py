@@ -10,7 +10,7 @@ class EnumSymbolParserTest(TestCase):
             kActivityViewSection = 2
         };
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             ["MyCheckInsViewControllerSection", "kStatusCellSection", "kCheckInsSection", "kActivityViewSection"],
             parse(content)
         )
@@ -30,7 +30,7 @@ class EnumSymbolParserTest(TestCase):
 
 
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             ["MyCheckInsViewControllerSection", "kStatusCellSection", "kCheckInsSection", "kActivityViewSection"],
             parse(content)
         )
@@ -43,7 +43,7 @@ class EnumSymbolParserTest(TestCase):
           YPWeeklyYelpRequestSourceMoreMenu,
         };
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             ["YPWeeklyYelpRequestSource", "YPWeeklyYelpRequestSourceUnknown", "YPWeeklyYelpRequestSourceDiscover", "YPWeeklyYelpRequestSourceMoreMenu"],
             parse(content)
         )
@@ -62,7 +62,7 @@ class EnumSymbolParserTest(TestCase):
           YPWeeklyYelpRequestSourceMoreMenu, // request weekly from the weekly button in the more menu
         };
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             ["YPWeeklyYelpRequestSource", "YPWeeklyYelpRequestSourceUnknown", "YPWeeklyYelpRequestSourceDiscover", "YPWeeklyYelpRequestSourceMoreMenu"],
             parse(content)
         )
@@ -73,7 +73,7 @@ class EnumSymbolParserTest(TestCase):
             AccountPaymentMethodsSectionAllMethods = 0,
             AccountPaymentMethodsSectionAddNewCard};
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             ["AccountPaymentMethodsSection", "AccountPaymentMethodsSectionAllMethods", "AccountPaymentMethodsSectionAddNewCard"],
             parse(content)
         )
@@ -83,7 +83,7 @@ class EnumSymbolParserTest(TestCase):
         NS_OPTIONS(NSUInteger, AccountPaymentMethodsSection){ AccountPaymentMethodsSectionAllMethods = 0,
             AccountPaymentMethodsSectionAddNewCard};
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             ["AccountPaymentMethodsSection", "AccountPaymentMethodsSectionAllMethods", "AccountPaymentMethodsSectionAddNewCard"],
             parse(content)
         )
@@ -92,7 +92,7 @@ class EnumSymbolParserTest(TestCase):
         content = """
         NS_OPTIONS(NSUInteger, AccountPaymentMethodsSection){ AccountPaymentMethodsSectionAllMethods = 0, AccountPaymentMethodsSectionAddNewCard};
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             ["AccountPaymentMethodsSection", "AccountPaymentMethodsSectionAllMethods", "AccountPaymentMethodsSectionAddNewCard"],
             parse(content)
         )
@@ -101,7 +101,7 @@ class EnumSymbolParserTest(TestCase):
         content = """
         typedef NS_OPTIONS(NSUInteger, YPSearchFilterTableViewGroupIdentifier);
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             [],
             parse(content)
         )
@@ -117,7 +117,7 @@ class EnumSymbolParserTest(TestCase):
         NS_OPTIONS(NSUInteger, AccountPaymentMethodsSection){ AccountPaymentMethodsSectionAllMethods = 0,
             AccountPaymentMethodsSectionAddNewCard};
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             [
                 "YPWeeklyYelpRequestSource",
                 "YPWeeklyYelpRequestSourceUnknown",
@@ -139,7 +139,7 @@ class EnumSymbolParserTest(TestCase):
             kActivityViewSection = 1 << 3
         };
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             ["MyCheckInsViewControllerSection", "kStatusCellSection", "kCheckInsSection", "kActivityViewSection"],
             parse(content)
         )
@@ -152,7 +152,7 @@ class EnumSymbolParserTest(TestCase):
             kActivityViewSection = (1 << 3)
         };
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             ["MyCheckInsViewControllerSection", "kStatusCellSection", "kCheckInsSection", "kActivityViewSection"],
             parse(content)
         )
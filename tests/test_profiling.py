@@ -0,0 +1,53 @@
+from io import StringIO
+from unittest import TestCase
+
+import json
+import os
+import pstats
+import shutil
+import tempfile
+
+import profiling
+import search
+from tests.test_search import HEADER
+
+class ProfilingTest(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'Foo.h')
+        with open(self.path, 'wb') as header:
+            header.write(HEADER.encode('ascii'))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_same_symbols_as_get_symbols(self):
+        path, symbols, file_profile = search.get_symbols_profiled(self.path)
+        self.assertEqual(search.get_symbols(self.path), (path, symbols))
+        self.assertEqual(
+            ["read"] + [profiling.parser_name(parser) for parser in search.PARSERS],
+            [stage.name for stage in file_profile.stages]
+        )
+        self.assertEqual(len(symbols), sum(stage.symbols for stage in file_profile.stages))
+        self.assertIsNone(file_profile.stats)
+
+    def test_run_profile(self):
+        run_profile = profiling.RunProfile()
+        for _ in range(2):
+            run_profile.add(search.get_symbols_profiled(self.path, with_pstats=True)[2])
+        self.assertEqual(2 * len(HEADER), run_profile.stages["enum"][1])
+
+        stream = StringIO()
+        run_profile.report(stream, 1)
+        self.assertIn("2 headers parsed", stream.getvalue())
+        self.assertEqual(1, stream.getvalue().count(self.path))
+
+        json_path = os.path.join(self.directory, 'profile.json')
+        run_profile.write_json(json_path)
+        with open(json_path) as json_file:
+            report = json.load(json_file)
+        self.assertEqual([self.path] * 2, [entry['path'] for entry in report['files']])
+
+        stats_path = os.path.join(self.directory, 'profile.pstats')
+        run_profile.dump_stats(stats_path)
+        self.assertTrue(pstats.Stats(stats_path).total_calls)
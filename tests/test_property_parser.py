@@ -0,0 +1,60 @@
+from unittest import TestCase
+
+from parsers import property, utils
+from parsers.property import parse
+
+class PropertySymbolParserTest(TestCase):
+    def _assertParse(self, expected, content):
+        self.assertCountEqual(
+            expected,
+            parse(content)
+        )
+
+    def _aliases(self, content):
+        header = utils.Header(utils.scrub_comments(content))
+        return {symbol.name: symbol.aliases for symbol in property.parse.symbols(header)}
+
+    def test_properties(self):
+        content = """
+        @interface YPUserBadgeView : UIView {
+          NSString *_userName;
+        }
+        @property (copy, nonatomic) NSString *userName;
+        @property (readonly, nonatomic) YPUserBadgeViewStyle style;
+        @property BOOL elite;
+        //@property (assign, nonatomic) CGSize imageSize;
+        - (void)setUser:(User *)user;
+        @end
+        """
+        self._assertParse(["userName", "style", "elite"], content)
+
+    def test_block_and_generic_types(self):
+        content = """
+        @property (copy, nonatomic) void (^completion)(NSArray *businesses, NSError *error);
+        @property (strong, nonatomic) NSDictionary<NSString *, NSArray<NSNumber *> *> *counts;
+        @property (weak, nonatomic) IBOutlet id<YPUserBadgeViewDelegate> delegate;
+        """
+        self._assertParse(["completion", "counts", "delegate"], content)
+
+    def test_trailing_macros(self):
+        content = """
+        @property (nonatomic) NSInteger count NS_SWIFT_NAME(total);
+        @property (nonatomic) CGFloat legacy NS_UNAVAILABLE;
+        @property (class, readonly) YPSession *sharedSession API_AVAILABLE(ios(10.0));
+        @property (nonatomic) NSURL *URL __attribute__((deprecated("use link")));
+        """
+        self._assertParse(["count", "legacy", "sharedSession", "URL"], content)
+
+    def test_accessors(self):
+        content = """
+        @property (copy, nonatomic) NSString *userName;
+        @property (readonly, nonatomic) YPUserBadgeViewStyle style;
+        @property (nonatomic, getter=isElite) BOOL elite;
+        @property (nonatomic, setter=updateCount:) NSInteger count;
+        """
+        self.assertEqual({
+            "userName": ("setUserName:", "_userName"),
+            "style": ("_style",),
+            "elite": ("isElite", "setElite:", "_elite"),
+            "count": ("updateCount:", "_count"),
+        }, self._aliases(content))
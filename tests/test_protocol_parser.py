@@ -3,7 +3,7 @@ from parsers.protocol import parse
 
 class ProtocolSymbolParserTest(TestCase):
     def _assertParse(self, expected, content):
-        self.assertItemsEqual(
+        self.assertCountEqual(
             expected,
             parse(content)
         )
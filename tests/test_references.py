@@ -0,0 +1,133 @@
+from unittest import TestCase
+
+import timeit
+
+from matcher import IdentifierMatcher, AhoCorasickMatcher
+from references import blank_method_names, parse_references, selector_references, build_index, find_dead_symbols
+
+class ReferencesTest(TestCase):
+    def test_parse_references(self):
+        content = """
+        #import "YPWatchController.h"
+
+        // YPUnusedInComment
+        @implementation YPWatchController
+        - (void)load {
+            /* YPAlsoInComment */
+            [self loadWithType:YPWatchErrorTypeGeneric];
+        }
+        @end
+        """
+        references = parse_references(content)
+        self.assertTrue({"YPWatchController", "loadWithType", "YPWatchErrorTypeGeneric", "self"} <= references)
+        self.assertNotIn("YPUnusedInComment", references)
+        self.assertNotIn("YPAlsoInComment", references)
+
+    def test_build_index_restricted_to_symbols(self):
+        index = build_index([
+            ("a.m", {"Foo", "Bar", "self"}),
+            ("b.m", {"Foo"}),
+        ], {"Foo", "Bar"})
+        self.assertEqual({"Foo": {"a.m", "b.m"}, "Bar": {"a.m"}}, index)
+
+    def test_find_dead_symbols(self):
+        symbol_info = [
+            ("Foo.h", ["Foo", "FooUnused", "FooSelfReferenced"]),
+            ("Bar.h", ["Bar"]),
+        ]
+        index = build_index([
+            ("Foo.h", {"Foo", "FooUnused", "FooSelfReferenced"}),
+            ("Foo.m", {"Foo"}),
+            ("Bar.h", {"Bar", "Foo"}),
+            ("Baz.swift", {"Bar"}),
+        ])
+        self.assertCountEqual(
+            [("Foo.h", "FooUnused"), ("Foo.h", "FooSelfReferenced")],
+            list(find_dead_symbols(symbol_info, index))
+        )
+
+    def test_selector_references(self):
+        content = """
+        [self.controller loadWithType:type count:[items count] completion:^(BOOL done) {
+            label: [self reload:YES];
+        }];
+        SEL selector = @selector(viewWithFrame:style:);
+        [self performSelector:NSSelectorFromString(@"doThing:with:") withObject:nil];
+        [view setHidden:(flag ? YES : NO) animated:YES];
+        NSString *bracket = @"]";
+        [bracket hasPrefix:@"["];
+        """
+        self.assertEqual({
+            "loadWithType:count:completion:", "reload:", "viewWithFrame:style:", "performSelector:withObject:",
+            "doThing:with:", "setHidden:animated:", "hasPrefix:",
+        }, selector_references(content))
+
+    def test_parse_references_with_selectors(self):
+        content = """
+        [self loadWithType:type count:1];
+        [self reload];
+        """
+        symbols = ["loadWithType:count:", "loadWithType:", "reload", "unused:"]
+        self.assertEqual({"loadWithType:count:", "reload"}, parse_references(content) & set(symbols))
+        self.assertEqual({"loadWithType:count:", "reload"}, parse_references(content, IdentifierMatcher(symbols)))
+        # aho-corasick also matches fragments, "loadWithType:" is part of the send
+        self.assertEqual(
+            {"loadWithType:count:", "loadWithType:", "reload"},
+            parse_references(content, AhoCorasickMatcher(symbols))
+        )
+
+    def test_unary_method_heads_arent_uses(self):
+        content = """
+        @implementation Foo
+        - (void)unusedNoArg {
+            NSInteger total = self.count
+                - (NSInteger)offset;
+            [self reload];
+        }
+        + (instancetype)sharedFoo NS_SWIFT_NAME(shared());
+        - (void)reloadWith:(YPWatchOptions)options { }
+        @end
+        """
+        found = parse_references(content)
+        self.assertEqual(len(content), len(blank_method_names(content)))
+        self.assertFalse({"unusedNoArg", "sharedFoo"} & found)
+        self.assertTrue({"offset", "reload", "YPWatchOptions"} <= found)
+        self.assertFalse({"unusedNoArg"} & parse_references(content, IdentifierMatcher(["unusedNoArg", "reload"])))
+
+    def test_unary_method_heads_in_linear_time(self):
+        content = "\n- (void)reload\n{\n}\n"
+        self.assertEqual("\n- (void)      \n{\n}\n", blank_method_names(content))
+        # lines starting with "-" and no ";" or "{" used to be rescanned to the end of the file
+        seconds = timeit.timeit(lambda: blank_method_names("- a\n" * 8000), number=1)
+        self.assertLess(seconds, 0.5)
+
+    def test_find_dead_symbols_with_aliases(self):
+        symbol_info = [("Foo.h", ["userName", "style", "elite"])]
+        aliases = {
+            "userName": ("setUserName:", "_userName"),
+            "style": ("_style",),
+            "elite": ("isElite", "setElite:", "_elite"),
+        }
+        index = build_index([
+            ("Foo.h", {"userName", "style", "elite"}),
+            ("Foo.m", {"_style"}),
+            ("Bar.m", {"isElite"}),
+        ])
+        self.assertEqual([("Foo.h", "userName")], list(find_dead_symbols(symbol_info, index, aliases)))
+
+    def test_find_dead_symbols_with_referencing(self):
+        symbol_info = [("Foo.h", ["Foo", "FooView"])]
+        index = build_index([
+            ("Foo.h", {"Foo", "FooView"}),
+            ("Unrelated.m", {"Foo", "FooView"}),
+        ])
+        # Unrelated.m doesn't import Foo.h, so its "Foo" is some other Foo. FooView is exempt, like a
+        # class that can be forward declared
+        referencing = lambda header_path, symbol: None if symbol == "FooView" else lambda path: path in {"Foo.h", "Foo.m"}
+        self.assertEqual([("Foo.h", "Foo")], list(find_dead_symbols(symbol_info, index, None, referencing)))
+
+    def test_parse_references_with_imports(self):
+        content = '#import "Foo.h"\n// #import "Commented.h"\n[self useFoo:kFoo];\n'
+        found, names = parse_references(content, IdentifierMatcher(["kFoo"]), with_imports=True)
+        self.assertEqual({"kFoo"}, found)
+        self.assertEqual(["Foo.h"], names)
@@ -0,0 +1,207 @@
+from contextlib import closing
+from itertools import chain
+from io import StringIO
+from unittest import TestCase
+from unittest.mock import patch
+from multiprocessing import Pool
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import search
+from parsers.utils import Symbol
+
+HEADER = """
+// Options for the thing
+#define kButtonHeight 37
+
+typedef NS_ENUM(NSInteger, YPWatchErrorType) {
+  YPWatchErrorTypeGeneric = 0, /* the default */
+  YPWatchErrorTypeUnknown
+};
+
+typedef void (^YPWatchSearchCompletionBlock)(NSArray *businesses, YKError *error);
+
+extern NSString * const YPWatchErrorDomain;
+
+NSString *YPNSStringFromYPGender(YPGender gender);
+
+@protocol YPWatchDelegate <NSObject>
+- (void)watchDidFinish;
+@end
+
+@interface YPWatchController : NSObject
+@property (readonly, copy, nonatomic) NSString *marketId;
+@end
+
+typedef struct {
+  unsigned int appendUnits : 1;
+} YPWatchOptions;
+"""
+
+class SearchTest(TestCase):
+    def test_parse_content_matches_individual_parsers(self):
+        self.assertCountEqual(
+            list(chain(*(parser.parse(HEADER) for parser in search.PARSERS))),
+            [symbol.name for symbol in search.parse_content(HEADER)]
+        )
+
+    def test_parse_content_locations(self):
+        symbols = search.parse_content(HEADER)
+        for symbol in symbols:
+            self.assertEqual(symbol.name, HEADER[symbol.offset:symbol.offset + len(symbol.name)])
+            line = HEADER.splitlines()[symbol.line - 1]
+            self.assertEqual(symbol.name, line[symbol.column - 1:symbol.column - 1 + len(symbol.name)])
+        self.assertIn(Symbol("kButtonHeight", "define", 3, 9, HEADER.index("kButtonHeight")), symbols)
+        self.assertIn(Symbol("YPWatchErrorTypeUnknown", "enum_constant", 7, 3, HEADER.index("YPWatchErrorTypeUnknown")), symbols)
+        self.assertIn(Symbol("YPWatchController", "interface", 20, 12, HEADER.index("YPWatchController")), symbols)
+        self.assertIn(Symbol("appendUnits", "struct_field", 25, 16, HEADER.index("appendUnits")), symbols)
+        self.assertIn(Symbol("YPWatchOptions", "struct", 26, 3, HEADER.index("YPWatchOptions")), symbols)
+
+    def test_write_ndjson(self):
+        stream = StringIO()
+        search.write_ndjson(stream, "Foo.h", [Symbol("kFoo", "define", 2, 9, 9), Symbol("FooType", "enum", 4, 28, 60)])
+        self.assertEqual(
+            [
+                {"path": "Foo.h", "name": "kFoo", "kind": "define", "line": 2, "column": 9, "offset": 9},
+                {"path": "Foo.h", "name": "FooType", "kind": "enum", "line": 4, "column": 28, "offset": 60},
+            ],
+            [json.loads(line) for line in stream.getvalue().splitlines()]
+        )
+
+    def test_map_unordered_in_process_and_pooled(self):
+        items = list(range(50))
+        self.assertCountEqual([i * 2 for i in items], list(search.map_unordered(_double, items, 1)))
+        self.assertCountEqual([i * 2 for i in items], list(search.map_unordered(_double, iter(items), 2)))
+
+    def test_map_unordered_leaves_a_given_pool_open(self):
+        with closing(Pool(2)) as pool:
+            for _ in range(2):
+                self.assertCountEqual([i * 2 for i in range(20)], list(search.map_unordered(_double, range(20), 2, pool=pool)))
+
+    def test_chunks_grow_with_the_tasks_handed_out(self):
+        sizes = [len(chunk) for chunk in search.chunked(iter(range(5000)), 2)]
+        self.assertEqual(5000, sum(sizes))
+        self.assertEqual([1] * 8, sizes[:8])
+        self.assertEqual(sorted(sizes[:-1]), sizes[:-1])
+        self.assertEqual(search.MAX_CHUNKSIZE, max(sizes))
+
+    def test_job_count(self):
+        self.assertEqual(3, search.job_count("3"))
+        for value in ("0", "-2"):
+            with self.assertRaises(argparse.ArgumentTypeError):
+                search.job_count(value)
+
+    def test_ndjson_rejects_plain_reports(self):
+        for option in ('--check', '--dead', '--since=HEAD'):
+            with patch('sys.argv', ['search.py', '.', '--format', 'ndjson', option]), patch('sys.stderr', StringIO()):
+                with self.assertRaises(SystemExit):
+                    search.main()
+
+    def test_ndjson_reader_stops_early(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        with open(os.path.join(directory, "Foo.h"), 'w') as header:
+            header.write("".join("#define kFoo%d %d\n" % (i, i) for i in range(20000)))
+        process = subprocess.Popen(
+            [sys.executable, search.__file__, directory, '--format', 'ndjson', '--no-cache', '--jobs', '1'],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        self.assertEqual("kFoo0", json.loads(process.stdout.readline())["name"])
+        process.stdout.close()
+        stderr = process.stderr.read()
+        process.stderr.close()
+        self.assertEqual(0, process.wait())
+        self.assertEqual(b"", stderr)
+
+    def test_import_pruning_exempts_message_sends(self):
+        scanned = [("app/YPFoo.h", []), ("app/YPFoo.m", ["YPFoo.h"]), ("app/YPOther.m", [])]
+        symbol_info = [("app/YPFoo.h", ["kYPFoo", "reload", "userName"])]
+        aliases = {"userName": ("setUserName:", "_userName")}
+        # YPOther.m doesn't import YPFoo.h, but can still send reload and setUserName: to an id
+        index = {name: {"app/YPOther.m"} for name in ("kYPFoo", "reload", "setUserName:")}
+        referencing = search.import_pruning(scanned, {"reload", "userName"})
+        self.assertEqual(
+            [("app/YPFoo.h", "kYPFoo")],
+            list(search.references.find_dead_symbols(symbol_info, index, aliases, referencing))
+        )
+        self.assertTrue({"selector", "property"} <= search.UNPRUNED_KINDS)
+
+    def test_dead_sees_prefix_header_imports(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        os.mkdir(os.path.join(directory, "App"))
+        files = {
+            "Foo.h": "extern NSString *const kYPFoo;\nvoid YPDoThing(void);\nextern NSString *const kYPUnused;\n",
+            "Prefix.pch": '#import "Foo.h"\n',
+            "Bar.m": "void YPBar(void) {\n    YPDoThing();\n    NSLog(@\"%@\", kYPFoo);\n}\n",
+        }
+        for name, content in files.items():
+            with open(os.path.join(directory, "App", name), 'w') as source:
+                source.write(content)
+        # Bar.m doesn't import Foo.h itself, but the prefix header is compiled into it
+        for extra in ([], ['--no-prune']):
+            argv = ['search.py', os.path.join(directory, "App"), '--dead', '--no-cache', '--jobs', '1'] + extra
+            with patch('sys.argv', argv), patch('sys.stdout', StringIO()) as stdout:
+                search.main()
+            self.assertEqual(["kYPUnused"], [line.split()[1] for line in stdout.getvalue().splitlines()])
+
+    def test_analyze_buffers(self):
+        buffers = [("Watch.h", HEADER.encode('latin-1')), ("Empty.h", b"")]
+        expected = {"Watch.h": search.parse_content(HEADER), "Empty.h": []}
+        self.assertEqual(expected, dict(search.analyze_buffers(iter(buffers))))
+        self.assertEqual(expected, dict(search.analyze_buffers(buffers, jobs=2)))
+
+    def test_analyze_buffers_is_lazy(self):
+        consumed = []
+        def buffers():
+            for name in ("A.h", "B.h"):
+                consumed.append(name)
+                yield name, b"#define kFoo 1\n"
+        results = search.analyze_buffers(buffers())
+        self.assertEqual([], consumed)
+        self.assertEqual("A.h", next(results)[0])
+        self.assertEqual(["A.h"], consumed)
+
+    def test_analyze_buffers_cached_by_content(self):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        parsed = list(search.analyze_buffers([("Watch.h", HEADER.encode('latin-1'))], cache_dir=cache_dir))
+        # renamed but unchanged, so it never reaches the parsers
+        with patch.object(search, 'parse_buffer', None):
+            cached = list(search.analyze_buffers([("Other/Watch.h", HEADER.encode('latin-1'))], cache_dir=cache_dir))
+        self.assertEqual([("Other/Watch.h", parsed[0][1])], cached)
+
+    def test_pool_starts_before_any_thread(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        for i in range(20):
+            with open(os.path.join(directory, "%d.h" % i), 'w') as header:
+                header.write("#define kFoo%d 1\n" % i)
+        started = []
+        def recording_pool(*args):
+            started.append(threading.active_count())
+            return Pool(*args)
+        args = argparse.Namespace(jobs=2, no_cache=False, cache_dir=os.path.join(directory, "cache"))
+        with patch.object(search, 'Pool', recording_pool):
+            results = dict(search.resolve_symbols(search.iter_files([directory], {'.h'}), args))
+        # forked before the walker's threads and the cache's parse thread were started
+        self.assertEqual([1], started)
+        self.assertEqual(20, len(results))
+
+    def test_analyze_buffers_uses_one_pool(self):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        buffers = [("%d.h" % i, ("#define kFoo%d 1\n" % i).encode('latin-1')) for i in range(600)]
+        with patch.object(search, 'map_unordered', wraps=search.map_unordered) as map_unordered:
+            results = dict(search.analyze_buffers(buffers, jobs=2, cache_dir=cache_dir))
+        self.assertEqual(1, map_unordered.call_count)
+        self.assertEqual(["kFoo599"], [symbol.name for symbol in results["599.h"]])
+
+def _double(value):
+    return value * 2
@@ -0,0 +1,86 @@
+from unittest import TestCase
+
+from parsers.selector import parse
+
+class SelectorSymbolParserTest(TestCase):
+    def _assertParse(self, expected, content):
+        self.assertCountEqual(
+            expected,
+            parse(content)
+        )
+
+    def test_interface(self):
+        content = """
+        @interface YPUserBadgeView : UIView {
+          NSString *_userName;
+        }
+        @property (copy, nonatomic) NSString *userName;
+        - (id)initWithFrame:(CGRect)frame style:(YPUserBadgeViewStyle)style;
+        - (void)setUser:(User *)user;
+        + (CGFloat)height;
+        @end
+        """
+        self._assertParse(["initWithFrame:style:", "setUser:", "height"], content)
+
+    def test_protocol(self):
+        content = """
+        @protocol YPUserBadgeViewDelegate <NSObject>
+        - (void)badgeViewDidTap:(YPUserBadgeView *)view;
+        @optional
+        - (BOOL)badgeView:(YPUserBadgeView *)view shouldShowUser:(User *)user;
+        @end
+        """
+        self._assertParse(["badgeViewDidTap:", "badgeView:shouldShowUser:"], content)
+
+    def test_block_and_generic_types(self):
+        content = """
+        @interface YPWatchSearch : NSObject
+        - (void)searchWithCompletion:(void (^)(NSArray *businesses, YKError *error))completion queue:(dispatch_queue_t)queue;
+        - (NSDictionary<NSString *, id> *)attributes;
+        - (void (^)(BOOL))handler;
+        @end
+        """
+        self._assertParse(["searchWithCompletion:queue:", "attributes", "handler"], content)
+
+    def test_attributes(self):
+        content = """
+        @interface YPWatchSearch : NSObject
+        - (instancetype)init NS_UNAVAILABLE;
+        - (instancetype)initWithQuery:(NSString *)query NS_SWIFT_NAME(init(query:)) NS_DESIGNATED_INITIALIZER;
+        - (void)load:(id)sender __attribute__((deprecated("use load:completion:")));
+        @end
+        """
+        self._assertParse(["init", "initWithQuery:", "load:"], content)
+
+    def test_multi_line(self):
+        content = """
+        @interface YPWatchSearch : NSObject
+        - (void)searchWithQuery:(NSString *)query
+                       location:(CLLocation *)location
+                     completion:(YPWatchSearchCompletionBlock)completion;
+        @end
+        """
+        self._assertParse(["searchWithQuery:location:completion:"], content)
+
+    def test_only_in_declarations(self):
+        content = """
+        @class YPWatchSearch;
+        @protocol YPWatchDelegate;
+        static inline int YPClamp(int value, int low, int high) { return value - low; }
+        - (void)notInABlock:(id)sender;
+        @interface YPWatchSearch : NSObject
+        - (void)search;
+        - (void)search;
+        @end
+        """
+        self._assertParse(["search"], content)
+
+    def test_commented_out(self):
+        content = """
+        @interface YPWatchSearch : NSObject
+        // - (void)oldSearch:(id)sender;
+        /* - (void)olderSearch:(id)sender; */
+        - (void)search;
+        @end
+        """
+        self._assertParse(["search"], content)
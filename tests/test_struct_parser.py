@@ -1,6 +1,7 @@
 from unittest import TestCase
 
 from parsers.struct import parse
+from parsers.utils import Header
 
 class EnumSymbolParserTest(TestCase):
     def test_structs(self):
@@ -16,7 +17,7 @@ class EnumSymbolParserTest(TestCase):
           unsigned int abbreviateUnits : 1; // If YES use unit abbreviations (i.e. miles -> mi)
         } YPLocalizationDistanceOptions;
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             [
             "YPLocalizationDistanceOptions",
             "appendUnits",
@@ -29,3 +30,28 @@ class EnumSymbolParserTest(TestCase):
             ],
             parse(content)
         )
+
+    def test_nested_fields_once(self):
+        content = """
+        typedef struct {
+          struct {
+            int a : 1;
+          } inner;
+          union {
+            struct { int c : 1; } deeper;
+            int d : 2;
+          } either;
+          int b : 2;
+        } YPOuter;
+        """
+        self.assertCountEqual(["YPOuter", "inner", "a", "either", "deeper", "c", "d", "b"], parse(content))
+
+    def test_unions(self):
+        content = """
+        typedef union {
+          unsigned int raw : 8;
+          struct { unsigned int low : 4; } halves;
+        } YPUnion;
+        """
+        self.assertCountEqual(["YPUnion", "raw", "halves", "low"], parse(content))
+        self.assertIn(("YPUnion", "union"), [(symbol.name, symbol.kind) for symbol in parse.symbols(Header(content))])
@@ -5,7 +5,7 @@ from parsers.typedef import parse
 
 class TypedefSymbolParserTest(TestCase):
     def _assertParse(self, expected, content):
-        self.assertItemsEqual(
+        self.assertCountEqual(
             expected,
             parse(content)
         )
@@ -35,7 +35,7 @@ class TypedefSymbolParserTest(TestCase):
         };
         typedef NSInteger YPReviewActivity;
         """
-        self.assertItemsEqual(["YPReviewActivity"], parse(content))
+        self.assertCountEqual(["YPReviewActivity"], parse(content))
 
     def test_block(self):
         content = """
@@ -80,8 +80,44 @@ typedef NS_ENUM(NSInteger, YPAccountBaseViewControllerSource) {
 - (void)accountViewControllerShouldBeDismissed:(YPAccountBaseViewController *)accountViewController completion:(void (^)(void))completion;
 @end
         """
-        self.assertItemsEqual(
+        self.assertCountEqual(
             [],
             parse(content)
         )
 
+    def test_function_pointers(self):
+        content = """
+        typedef void (*YPCallback)(int value);
+        typedef int (* _Nullable YPNullableCallback)(void);
+        typedef void YPFunction(int *pointer);
+        typedef void (NS_NOESCAPE ^YPNoEscapeBlock)(void);
+        """
+        self._assertParse(["YPCallback", "YPNullableCallback", "YPFunction", "YPNoEscapeBlock"], content)
+
+    def test_generics(self):
+        content = """
+        typedef NSArray<YPFoo *> *YPFooList;
+        typedef NSDictionary<NSString *, id<YPBar>> *YPBarMap;
+        typedef NSString *(^YPTransform)(NSArray<NSString *> *values, void (^done)(void));
+        """
+        self._assertParse(["YPFooList", "YPBarMap", "YPTransform"], content)
+
+    def test_struct_typedefs(self):
+        content = """
+        typedef struct { int width; } YPInlineSize;
+        typedef struct _YPThing {
+          int count;
+        } YPThing;
+        typedef struct YPOpaque *YPOpaqueRef;
+        typedef NSInteger YPCount;
+        """
+        # bodies are left to the struct parser
+        self._assertParse(["YPOpaqueRef", "YPCount"], content)
+
+    def test_attribute_macros(self):
+        content = """
+        typedef NSInteger YPSwiftCount NS_SWIFT_NAME(Count);
+        typedef NS_ENUM(NSInteger, YPForward);
+        typedef NSInteger YPOldCount __attribute__((deprecated));
+        """
+        self._assertParse(["YPSwiftCount", "YPForward", "YPOldCount"], content)
@@ -0,0 +1,187 @@
+from unittest import TestCase
+
+import os
+import random
+import re
+import shutil
+import tempfile
+from parsers.utils import BlockNames, Header, brace_blocks, read_header, scrub_comments, scrub_inactive, scrub_preprocessor
+
+def _spaces(text):
+    return " " * len(text)
+
+class ScrubCommentsTest(TestCase):
+    def _assertScrub(self, expected, content):
+        scrubbed = scrub_comments(content)
+        self.assertEqual(expected, scrubbed)
+        self.assertEqual(len(content), len(scrubbed))
+
+    def test_comments_are_blanked(self):
+        self._assertScrub(
+            "int a; " + _spaces("// note") + "\nint b; " + _spaces("/* more */") + "int c;\n",
+            "int a; // note\nint b; /* more */int c;\n"
+        )
+
+    def test_multi_line_comments_keep_newlines(self):
+        self._assertScrub("a   \n  \n   b", "a /*\n x\n */b")
+
+    def test_comment_at_end_of_file(self):
+        self._assertScrub("int a; " + _spaces("// end"), "int a; // end")
+
+    def test_unterminated_comment(self):
+        self._assertScrub("int a;   \n    ", "int a; /*\n int")
+
+    def test_url_in_string(self):
+        content = 'static NSString * const kURL = @"http://www.yelp.com/biz";\n'
+        self._assertScrub(content, content)
+
+    def test_comment_markers_in_strings(self):
+        content = 'NSString *a = @"/* not a comment */", *b = @"// nor this";\n'
+        self._assertScrub(content, content)
+
+    def test_escaped_quote_in_string(self):
+        self._assertScrub(
+            'char *a = "say \\"/*hi*/\\""; ' + _spaces("// done") + '\n',
+            'char *a = "say \\"/*hi*/\\""; // done\n'
+        )
+
+    def test_char_literals(self):
+        self._assertScrub(
+            "char a = '/', b = '\\'', c = '\"'; " + _spaces("/* x */") + "\nint d;\n",
+            "char a = '/', b = '\\'', c = '\"'; /* x */\nint d;\n"
+        )
+
+    def test_string_inside_comment(self):
+        self._assertScrub("int a; " + _spaces('/* "unterminated */') + "\n", 'int a; /* "unterminated */\n')
+
+    def test_string_continued_on_next_line(self):
+        content = 'char *a = "one \\\n// two";\n'
+        self._assertScrub(content, content)
+
+    def test_apostrophe_in_comment(self):
+        self._assertScrub(
+            _spaces("// don't") + "\nint a; " + _spaces("// it's") + "\n",
+            "// don't\nint a; // it's\n"
+        )
+
+    def test_nul_in_comment(self):
+        self._assertScrub("int a; " + _spaces("/* \0 */") + "\n", "int a; /* \0 */\n")
+
+class ScrubPreprocessorTest(TestCase):
+    def test_directives_are_blanked(self):
+        content = "A,\n#if DEBUG\nB,\n#endif\nC\n"
+        self.assertEqual("A,\n         \nB,\n      \nC\n", scrub_preprocessor(content))
+
+class ScrubInactiveTest(TestCase):
+    def _assertKept(self, kept, removed, content):
+        scrubbed = scrub_inactive(content)
+        self.assertEqual(len(content), len(scrubbed))
+        self.assertEqual(content.count("\n"), scrubbed.count("\n"))
+        for text in kept:
+            self.assertIn(text, scrubbed)
+        for text in removed:
+            self.assertNotIn(text, scrubbed)
+
+    def test_if_zero(self):
+        content = "#if 0\n#define kDead 1\n#endif\n#define kLive 1\n"
+        self._assertKept(["kLive", "#if 0", "#endif"], ["kDead"], content)
+
+    def test_else_and_elif(self):
+        content = "#if (1)\nint a;\n#else\nint b;\n#endif\n#if 0\nint c;\n#elif 1\nint d;\n#else\nint e;\n#endif\n"
+        self._assertKept(["int a;", "int d;"], ["int b;", "int c;", "int e;"], content)
+
+    def test_unknown_conditions_are_kept(self):
+        content = "#ifdef DEBUG\nint a;\n#else\nint b;\n#endif\n#if TARGET_OS_IOS\nint c;\n#elif 0\nint d;\n#endif\n"
+        self._assertKept(["int a;", "int b;", "int c;"], ["int d;"], content)
+
+    def test_macros_defined_in_the_header(self):
+        content = "#define FOO 1\n#ifdef FOO\nint a;\n#endif\n#ifndef FOO\nint b;\n#endif\n#undef FOO\n#ifdef FOO\nint c;\n#endif\n"
+        self._assertKept(["int a;", "int c;"], ["int b;"], content)
+
+    def test_nested(self):
+        content = "#if 0\n#if 1\nint a;\n#endif\nint b;\n#else\nint c;\n#endif\n"
+        self._assertKept(["int c;"], ["int a;", "int b;"], content)
+
+    def test_unterminated_and_unbalanced(self):
+        self._assertKept(["int a;"], ["int b;"], "#endif\nint a;\n#if 0\nint b;\n")
+
+class BraceBlocksTest(TestCase):
+    def test_classification(self):
+        content = """
+        typedef NS_ENUM(NSInteger, YPWatchErrorType) { YPWatchErrorTypeGeneric };
+        typedef NS_OPTIONS(NSUInteger, YPWatchOptions) { YPWatchOptionsNone };
+        typedef enum { YPVoteButtonTypeUseful } YPVoteButtonType;
+        enum { YPReviewActivityNone };
+        typedef struct { unsigned int appendUnits : 1; } YPLocalizationDistanceOptions;
+        typedef union { int i; float f; } YPValue;
+        @interface YPWatchController : NSObject { NSString *_name; }
+        @end
+        """
+        self.assertEqual([
+            ("enum", "YPWatchErrorType"),
+            ("options", "YPWatchOptions"),
+            ("enum", "YPVoteButtonType"),
+            ("enum", None),
+            ("struct", "YPLocalizationDistanceOptions"),
+            ("union", "YPValue"),
+            ("other", None),
+        ], [(block.kind, block.name) for block in brace_blocks(content)])
+
+    def test_nested_blocks_innermost_first(self):
+        content = "static inline void f() { if (x) { y(); } }"
+        blocks = brace_blocks(content)
+        self.assertEqual([content.index("{ y"), content.index("{ if")], [block.open for block in blocks])
+        self.assertEqual(content.rindex("}"), blocks[1].close)
+
+    def test_name_offsets(self):
+        content = "typedef struct {\n  int flag : 1;\n} YPFlags;\n"
+        block = brace_blocks(content)[0]
+        self.assertEqual("YPFlags", content[block.name_offset:block.name_offset + len(block.name)])
+
+    def test_names_after_nested_closes(self):
+        content = "typedef struct { struct { int a : 1; } } YPOuter; struct { int b : 1; } };"
+        self.assertEqual([("struct", "YPOuter"), ("struct", "YPOuter"), ("struct", None)], [
+            (block.kind, block.name) for block in brace_blocks(content)
+        ])
+        # the same names the old per-block regex found, on random runs of braces, words and ";"
+        block_name_re = re.compile(r"\W*?(?:(\w+)\W*)?;", re.ASCII)
+        rng = random.Random(0)
+        for _ in range(500):
+            string = "".join(rng.choice(["}", "{", ";", " ", "YPName", "=", "*"]) for _ in range(rng.randrange(20)))
+            names = BlockNames(string)
+            for close in [i for i, character in enumerate(string) if character == "}"]:
+                match = block_name_re.match(string, close + 1)
+                expected = match and (match.group(1), match.start(1) if match.group(1) else None)
+                self.assertEqual(expected, names.after(close), (string, close))
+
+    def test_header_scans_once(self):
+        header = Header("typedef struct { int flag : 1; } YPFlags;")
+        self.assertIs(header.blocks(), header.blocks())
+
+class ReadHeaderTest(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _write(self, content):
+        path = os.path.join(self.directory, 'Foo.h')
+        with open(path, 'wb') as header:
+            header.write(content)
+        return path
+
+    def test_scrubbed(self):
+        path = self._write(b"#define kFoo 1 // comment\n")
+        self.assertEqual("#define kFoo 1           \n", read_header(path).content)
+
+    def test_empty_file(self):
+        path = self._write(b"")
+        self.assertEqual("", read_header(path).content)
+
+    def test_non_utf8(self):
+        path = self._write(b"// caf\xe9\n#define kCaf\xe9 1\nextern NSString * const kFoo;\n")
+        header = read_header(path)
+        self.assertIn("kFoo", header.content)
+        # one character per byte, so offsets are still byte offsets
+        self.assertEqual(len(b"// caf\xe9\n#define kCaf\xe9 1\n"), header.content.index("extern"))
@@ -0,0 +1,79 @@
+import os
+import shutil
+import tempfile
+import threading
+from unittest import TestCase
+from unittest.mock import patch
+
+import walker
+from walker import Walker
+
+class WalkerTest(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _touch(self, *paths):
+        for path in paths:
+            path = os.path.join(self.directory, path)
+            if not os.path.isdir(os.path.dirname(path)):
+                os.makedirs(os.path.dirname(path))
+            with open(path, 'w') as f:
+                f.write("")
+
+    def _walk(self, **kwargs):
+        walker = Walker({'.h', '.m'}, **kwargs)
+        return sorted(os.path.relpath(path, self.directory) for path in walker.walk([self.directory]))
+
+    def test_walks_nested_directories(self):
+        self._touch("A.h", "A.m", "A.swift", "Sub/B.h", "Sub/Deeper/C.m")
+        self.assertEqual(["A.h", "A.m", "Sub/B.h", "Sub/Deeper/C.m"], self._walk())
+
+    def test_default_excludes(self):
+        self._touch("A.h", "Pods/AFNetworking/AF.h", "Carthage/Build/X.h", "Sub/DerivedData/Y.h")
+        self.assertEqual(["A.h"], self._walk())
+
+    def test_exclude_globs(self):
+        self._touch("A.h", "Generated/B.h", "C+Private.h")
+        self.assertEqual(["A.h"], self._walk(excludes=("Generated", "*+Private.h")))
+
+    def test_closing_early_stops_the_threads(self):
+        self._touch(*("Sub%d/F%d.h" % (i, j) for i in range(20) for j in range(20)))
+        threads = threading.active_count()
+        walk = Walker({'.h'}, queue_size=2).walk([self.directory])
+        next(walk)
+        walk.close()
+        self.assertEqual(threads, threading.active_count())
+
+    def test_gitignore(self):
+        self._touch("A.h", "build/B.h", "Sub/C.h", "Sub/Skipped.h", "Sub/Nested/Skipped.h", "Vendor/D.h", "Vendor/Keep.h")
+        with open(os.path.join(self.directory, ".gitignore"), "w") as gitignore:
+            gitignore.write("# comment\nbuild/\n/Vendor/*\n!/Vendor/Keep.h\n")
+        with open(os.path.join(self.directory, "Sub", ".gitignore"), "w") as gitignore:
+            gitignore.write("Skipped.h\n")
+        self.assertEqual(["A.h", "Sub/C.h", "Vendor/Keep.h"], self._walk())
+        self.assertEqual(7, len(self._walk(gitignore=False)))
+
+    def test_small_queue(self):
+        names = ["Dir%d/File%d.h" % (i % 7, i) for i in range(200)]
+        self._touch(*names)
+        self.assertEqual(sorted(names), self._walk(threads=3, queue_size=2))
+
+    def test_missing_directory(self):
+        self.assertEqual([], list(Walker({'.h'}).walk([os.path.join(self.directory, "missing")])))
+
+    def test_gitignore_that_is_not_utf8(self):
+        self._touch("A.h", "Sub/caf\xe9.h", "Sub/B.h")
+        with open(os.path.join(self.directory, "Sub", ".gitignore"), "wb") as gitignore:
+            gitignore.write(b"caf\xe9.h\nB.h\n")
+        self.assertEqual(["A.h", "Sub/caf\xe9.h"], self._walk())
+
+    def test_worker_errors_reach_the_consumer(self):
+        self._touch("A.h", "Sub/B.h")
+        def failing(directory):
+            raise ValueError(directory)
+        with patch.object(walker, "read_gitignore", failing):
+            with self.assertRaises(ValueError):
+                self._walk()
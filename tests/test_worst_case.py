@@ -0,0 +1,38 @@
+from unittest import TestCase
+
+from benchmarks.bench_worst_case import CASES, FUZZ_CASES, MAX_SECONDS_PER_KB, seconds_per_kb
+from parsers import enum, struct, typedef
+
+class WorstCaseTest(TestCase):
+    def test_linear_time(self):
+        # each of these took seconds per 64 KB with the old backtracking regexes
+        for name, parser, make_content in CASES:
+            per_kb = seconds_per_kb(parser, make_content(64 * 1024))
+            self.assertLess(per_kb, MAX_SECONDS_PER_KB, "%s: %.6f s/KB" % (name, per_kb))
+
+    def test_fuzzed_linear_time(self):
+        for name, parser, make_content in FUZZ_CASES:
+            per_kb = seconds_per_kb(parser, make_content(64 * 1024))
+            self.assertLess(per_kb, MAX_SECONDS_PER_KB, "%s: %.6f s/KB" % (name, per_kb))
+
+    def test_unclosed_brace(self):
+        content = "typedef NS_ENUM(NSInteger, YPOpen) {\n  YPOpenValue\n"
+        self.assertCountEqual([], enum.parse(content))
+        self.assertCountEqual([], struct.parse("struct {\n  int flag : 1;\n"))
+
+    def test_forward_declaration_before_enum(self):
+        content = """
+        typedef NS_ENUM(NSInteger, YPForward);
+        @interface YPView : UIView {
+          NSString *_name;
+        }
+        @end
+        """
+        self.assertCountEqual([], enum.parse(content))
+
+    def test_typedef_stops_at_semicolon(self):
+        content = """
+        typedef NSInteger YPCount;
+        - (void)loadWithCompletion:(void (^)(BOOL finished))completion;
+        """
+        self.assertCountEqual(["YPCount"], typedef.parse(content))
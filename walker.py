@@ -0,0 +1,151 @@
+from fnmatch import fnmatch
+from queue import Empty, Queue
+
+import os
+import threading
+
+# build products and vendored dependencies that are never worth parsing
+DEFAULT_EXCLUDES = ('.git', 'Pods', 'Carthage', 'DerivedData')
+
+_DONE = object()
+
+class IgnoreRule(object):
+    __slots__ = ('base', 'pattern', 'negate', 'dir_only', 'anchored')
+
+    def __init__(self, base, pattern):
+        self.base = base
+        self.negate = pattern.startswith('!')
+        pattern = pattern.lstrip('!')
+        self.dir_only = pattern.endswith('/')
+        pattern = pattern.rstrip('/')
+        # like git, a pattern with a slash in it is relative to the directory of its .gitignore,
+        # anything else matches a name at any depth below it
+        self.anchored = '/' in pattern
+        self.pattern = pattern.lstrip('/')
+
+    def matches(self, path, name, is_dir):
+        if self.dir_only and not is_dir:
+            return False
+        if self.anchored:
+            return fnmatch(os.path.relpath(path, self.base), self.pattern)
+        return fnmatch(name, self.pattern)
+
+def read_gitignore(directory):
+    # git doesn't care about the encoding of a pattern, so a byte that isn't utf-8 just won't match
+    try:
+        with open(os.path.join(directory, '.gitignore'), 'r', encoding='utf-8', errors='replace') as gitignore:
+            lines = gitignore.read().splitlines()
+    except OSError:
+        return []
+    return [IgnoreRule(directory, line.strip()) for line in lines if line.strip() and not line.startswith('#')]
+
+def is_ignored(rules, path, name, is_dir):
+    ignored = False
+    for rule in rules:
+        if rule.matches(path, name, is_dir):
+            ignored = not rule.negate
+    return ignored
+
+def list_dir(directory):
+    # (name, path, is_dir) for every entry, not following symlinked directories, like os.walk
+    for entry in list(os.scandir(directory)):
+        yield entry.name, entry.path, entry.is_dir(follow_symlinks=False)
+
+class Walker(object):
+    # walks directories on a pool of threads and hands matching files out through a bounded queue,
+    # so a consumer (e.g. the parse pool) can start while the walk is still going
+
+    def __init__(self, extensions, excludes=DEFAULT_EXCLUDES, gitignore=True, threads=8, queue_size=1024):
+        self.extensions = extensions
+        self.excludes = excludes
+        self.gitignore = gitignore
+        self.threads = threads
+        self.queue_size = queue_size
+
+    def walk(self, dirs):
+        self._directories = Queue()
+        self._files = Queue(self.queue_size)
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+        for directory in dirs:
+            directory = os.path.abspath(directory)
+            rules = [IgnoreRule(directory, pattern) for pattern in self.excludes]
+            self._push(directory, rules)
+        if not self._pending:
+            return
+
+        threads = [threading.Thread(target=self._work) for _ in range(self.threads)]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+
+        try:
+            while True:
+                path = self._files.get()
+                if path is _DONE:
+                    return
+                if isinstance(path, Exception):
+                    raise path
+                yield path
+        finally:
+            # the consumer can stop early, so tell the workers and keep emptying the queue for any
+            # blocked handing over a file until they've all exited
+            self._stopped.set()
+            for _ in threads:
+                self._directories.put(_DONE)
+            for thread in threads:
+                while thread.is_alive():
+                    self._drain()
+                    thread.join(0.01)
+
+    def _drain(self):
+        try:
+            while True:
+                self._files.get_nowait()
+        except Empty:
+            pass
+
+    def _push(self, directory, rules):
+        with self._lock:
+            self._pending += 1
+        self._directories.put((directory, rules))
+
+    def _work(self):
+        while True:
+            item = self._directories.get()
+            if item is _DONE:
+                return
+            directory, rules = item
+            try:
+                if not self._stopped.is_set():
+                    self._scan(directory, rules)
+            except OSError:
+                # unreadable directory, skipped like os.walk does
+                pass
+            except Exception as error:
+                # raised from walk() in the consumer's thread, rather than lost with this one
+                self._files.put(error)
+            finally:
+                # a directory always counts as done, or walk() would wait for it forever
+                with self._lock:
+                    self._pending -= 1
+                    finished = not self._pending
+            if finished:
+                for _ in range(self.threads):
+                    self._directories.put(_DONE)
+                self._files.put(_DONE)
+
+    def _scan(self, directory, rules):
+        if self.gitignore:
+            rules = rules + read_gitignore(directory)
+        for name, path, is_dir in list_dir(directory):
+            if self._stopped.is_set():
+                return
+            if is_ignored(rules, path, name, is_dir):
+                continue
+            if is_dir:
+                self._push(path, rules)
+            elif os.path.splitext(name)[-1] in self.extensions:
+                self._files.put(path)